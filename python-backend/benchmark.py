@@ -0,0 +1,478 @@
+"""
+Benchmark / load-test for the ingest endpoints.
+
+Replays WAV files (or generated tone/noise audio) through /ingest/pcm, /ws/pcm
+and /ingest at real-time pace with N concurrent simulated sessions, then reports
+p50/p95/p99 chunk latency, real-time factor, throughput and server memory.
+Results are written as JSON so runs can be compared over time.
+
+Examples:
+  python benchmark.py --spawn --stub --sessions 4 --duration 20
+  python benchmark.py --url http://127.0.0.1:8000 --wav sample.wav --transport ws
+  python benchmark.py --spawn --stub --compare bench_results/previous.json
+"""
+import os
+import sys
+import io
+import json
+import time
+import uuid
+import wave
+import socket
+import asyncio
+import argparse
+import platform
+import tempfile
+import subprocess
+import urllib.request
+import urllib.error
+from types import SimpleNamespace, ModuleType
+from typing import List, Dict, Any, Optional
+
+import numpy as np
+
+SAMPLE_RATE = 16000
+TRANSPORTS = ("pcm", "ws", "ingest")
+
+
+# ============================================================================
+# Audio sources
+# ============================================================================
+
+def load_wav(path: str) -> np.ndarray:
+    """Load a PCM WAV file as mono float32 at 16 kHz."""
+    with wave.open(path, "rb") as wf:
+        channels, width, rate = wf.getnchannels(), wf.getsampwidth(), wf.getframerate()
+        raw = wf.readframes(wf.getnframes())
+    if width == 2:
+        audio = np.frombuffer(raw, dtype=np.int16).astype(np.float32) / 32768.0
+    elif width == 4:
+        audio = np.frombuffer(raw, dtype=np.int32).astype(np.float32) / 2147483648.0
+    elif width == 1:
+        audio = (np.frombuffer(raw, dtype=np.uint8).astype(np.float32) - 128.0) / 128.0
+    else:
+        raise ValueError(f"unsupported sample width {width} in {path}")
+    if channels > 1:
+        audio = audio.reshape(-1, channels).mean(axis=1)
+    if rate != SAMPLE_RATE:
+        n_out = int(len(audio) * SAMPLE_RATE / rate)
+        audio = np.interp(np.linspace(0, len(audio) - 1, n_out), np.arange(len(audio)), audio).astype(np.float32)
+    return audio
+
+
+def generate_signal(kind: str, seconds: float, seed: int = 0) -> np.ndarray:
+    """Synthetic audio: 'tone' (bursty 220-660 Hz tones), 'noise' (low white noise) or 'mixed'."""
+    rng = np.random.default_rng(seed)
+    n = int(seconds * SAMPLE_RATE)
+    t = np.arange(n, dtype=np.float32) / SAMPLE_RATE
+    if kind == "noise":
+        return (rng.standard_normal(n) * 0.003).astype(np.float32)
+    freq = 220.0 + 440.0 * (np.sin(2 * np.pi * 0.3 * t) * 0.5 + 0.5)
+    tone = 0.2 * np.sin(2 * np.pi * np.cumsum(freq) / SAMPLE_RATE)
+    # ~1.5 s "utterances" separated by pauses so silence gating is exercised
+    envelope = (np.sin(2 * np.pi * 0.25 * t) > -0.3).astype(np.float32)
+    audio = tone * envelope
+    if kind == "mixed":
+        audio = audio + rng.standard_normal(n) * 0.01
+    return audio.astype(np.float32)
+
+
+def wav_bytes(chunk: np.ndarray) -> bytes:
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(SAMPLE_RATE)
+        wf.writeframes((np.clip(chunk, -1, 1) * 32767).astype(np.int16).tobytes())
+    return buf.getvalue()
+
+
+# ============================================================================
+# Stub server (no Whisper / Argos / Piper required)
+# ============================================================================
+
+class StubWhisperModel:
+    """Sleeps audio_duration * STUB_RTF and returns one sentence per chunk."""
+
+    def __init__(self, name: str, device: str = "cpu", compute_type: str = "int8", **kwargs):
+        self.name = name
+        self.rtf = float(os.environ.get("STUB_RTF", "0.1"))
+        self.calls = 0
+
+    def transcribe(self, path: str, **kwargs):
+        try:
+            with wave.open(path, "rb") as wf:
+                duration = wf.getnframes() / float(wf.getframerate())
+        except Exception:
+            duration = 0.5
+        time.sleep(duration * self.rtf)
+        self.calls += 1
+        seg = SimpleNamespace(
+            start=0.0, end=duration, text=f"stub sentence {self.calls}.",
+            avg_logprob=-0.2, compression_ratio=1.2, no_speech_prob=0.01, words=[],
+        )
+        info = SimpleNamespace(language=kwargs.get("language") or "en", language_probability=0.99, duration=duration)
+        return iter([seg]), info
+
+
+def _stub_translate(text: str, from_code: str, to_code: str) -> str:
+    time.sleep(float(os.environ.get("STUB_TRANSLATE_S", "0.005")))
+    return f"[{to_code}] {text}"
+
+
+STUB_LANGS = ("es", "fr", "de", "ja", "pt")
+
+
+def _stub_installed_packages():
+    """English <-> STUB_LANGS, so non-English pairs exercise pivot routing."""
+    return [SimpleNamespace(from_code=a, to_code=b, from_name=a, to_name=b, package_version="stub")
+            for lang in STUB_LANGS for a, b in (("en", lang), (lang, "en"))]
+
+
+def _install_stub_modules():
+    """Provide faster_whisper / argostranslate when they are not installed."""
+    fw = ModuleType("faster_whisper")
+    fw.WhisperModel = StubWhisperModel
+    argos = ModuleType("argostranslate")
+    argos_tr = ModuleType("argostranslate.translate")
+    argos_tr.translate = _stub_translate
+    argos_pkg = ModuleType("argostranslate.package")
+    argos_pkg.get_installed_packages = _stub_installed_packages
+    argos.translate, argos.package = argos_tr, argos_pkg
+    stubs = {
+        "faster_whisper": fw,
+        "argostranslate": argos,
+        "argostranslate.translate": argos_tr,
+        "argostranslate.package": argos_pkg,
+    }
+    for name, mod in stubs.items():
+        try:
+            __import__(name)
+        except ImportError:
+            sys.modules[name] = mod
+
+
+def serve_stub(port: int):
+    """Run main.app with stubbed model, translator and TTS backends."""
+    _install_stub_modules()
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    import main
+    import uvicorn
+
+    main.WhisperModel = StubWhisperModel
+    main.argos_translate = SimpleNamespace(translate=_stub_translate)
+    main.argos_package = SimpleNamespace(get_installed_packages=_stub_installed_packages)
+
+    def _stub_piper(text: str, lang: str, out_dir: str) -> str:
+        os.makedirs(out_dir, exist_ok=True)
+        out_path = os.path.join(out_dir, f"tts_{uuid.uuid4().hex}.wav")
+        time.sleep(float(os.environ.get("STUB_TTS_S", "0.01")))
+        with open(out_path, "wb") as f:
+            f.write(wav_bytes(np.zeros(1600, dtype=np.float32)))
+        return out_path
+
+    main.run_piper = main._timed("run_piper")(_stub_piper)
+    uvicorn.run(main.app, host="127.0.0.1", port=port, log_level="warning")
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def spawn_server(stub: bool) -> tuple:
+    port = _free_port()
+    here = os.path.dirname(os.path.abspath(__file__))
+    if stub:
+        cmd = [sys.executable, os.path.abspath(__file__), "--serve-stub", "--port", str(port)]
+    else:
+        cmd = [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"]
+    # Fresh session log per run so earlier benchmark sessions are not recovered
+    env = dict(os.environ, SESSION_LOG_DIR=os.environ.get("SESSION_LOG_DIR") or tempfile.mkdtemp(prefix="bench_sessions_"))
+    proc = subprocess.Popen(cmd, cwd=here, env=env)
+    url = f"http://127.0.0.1:{port}"
+    deadline = time.time() + 120
+    while time.time() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"server exited with code {proc.returncode}")
+        try:
+            urllib.request.urlopen(url + "/ready", timeout=1).read()
+            return proc, url
+        except Exception:
+            time.sleep(0.25)
+    proc.terminate()
+    raise RuntimeError("server did not become ready within 120 s")
+
+
+def _rss_bytes(pid: Optional[int]) -> Optional[int]:
+    if pid is None:
+        return None
+    try:
+        import psutil  # type: ignore
+        return psutil.Process(pid).memory_info().rss
+    except ImportError:
+        pass
+    except Exception:
+        return None
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+
+# ============================================================================
+# Simulated clients
+# ============================================================================
+
+def _post(url: str, data: bytes, content_type: str) -> Dict[str, Any]:
+    req = urllib.request.Request(url, data=data, method="POST", headers={"Content-Type": content_type})
+    try:
+        with urllib.request.urlopen(req, timeout=60) as resp:
+            return json.loads(resp.read())
+    except urllib.error.HTTPError as e:
+        # 503 / 429 from admission control carry a JSON body with "error"
+        try:
+            return {**json.loads(e.read()), "status": e.code}
+        except ValueError:
+            return {"error": f"HTTP {e.code}", "status": e.code}
+
+
+def _multipart(field: str, filename: str, payload: bytes, mime: str) -> tuple:
+    boundary = uuid.uuid4().hex
+    body = (
+        f"--{boundary}\r\nContent-Disposition: form-data; name=\"{field}\"; filename=\"{filename}\"\r\n"
+        f"Content-Type: {mime}\r\n\r\n"
+    ).encode() + payload + f"\r\n--{boundary}--\r\n".encode()
+    return body, f"multipart/form-data; boundary={boundary}"
+
+
+async def _paced_chunks(audio: np.ndarray, chunk_s: float, duration: float, pace: bool):
+    """Yield (index, chunk) looping over `audio` for `duration` seconds of audio."""
+    size = int(chunk_s * SAMPLE_RATE)
+    total = int(duration / chunk_s)
+    start = time.perf_counter()
+    for i in range(total):
+        off = (i * size) % max(1, len(audio) - size)
+        if pace:
+            delay = start + i * chunk_s - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+        yield i, audio[off:off + size]
+
+
+def _record(results: Dict[str, Any], latency: float, chunk_s: float, resp: Optional[Dict[str, Any]]):
+    results["latencies"].append(latency)
+    results["audio_s"] += chunk_s
+    if resp is None:
+        results["errors"] += 1
+        return
+    if resp.get("error") in ("overloaded", "rate limited"):
+        results["rejected"] += 1
+    elif "error" in resp:
+        results["errors"] += 1
+    if resp.get("silence"):
+        results["silent"] += 1
+    results["segments"] += len(resp.get("newSegments") or [])
+    for stage, ms in (resp.get("timings") or {}).items():
+        results["server_stages"].setdefault(stage, []).append(ms)
+
+
+async def run_pcm_client(url: str, session: str, audio: np.ndarray, args, results: Dict[str, Any]):
+    qs = f"session={session}&target={args.target}&caption_lang={args.caption_lang}&sample_rate={SAMPLE_RATE}&model={args.model}&timings=true"
+    async for _, chunk in _paced_chunks(audio, args.chunk_s, args.duration, not args.no_pace):
+        t0 = time.perf_counter()
+        try:
+            resp = await asyncio.to_thread(_post, f"{url}/ingest/pcm?{qs}", chunk.astype(np.float32).tobytes(), "application/octet-stream")
+        except (urllib.error.URLError, OSError, ValueError):
+            resp = None
+        _record(results, time.perf_counter() - t0, args.chunk_s, resp)
+
+
+async def run_ingest_client(url: str, session: str, audio: np.ndarray, args, results: Dict[str, Any]):
+    qs = f"session={session}&target={args.target}&caption_lang={args.caption_lang}&timings=true"
+    async for i, chunk in _paced_chunks(audio, args.chunk_s, args.duration, not args.no_pace):
+        body, ctype = _multipart("file", f"chunk_{i}.wav", wav_bytes(chunk), "audio/wav")
+        t0 = time.perf_counter()
+        try:
+            resp = await asyncio.to_thread(_post, f"{url}/ingest?{qs}", body, ctype)
+        except (urllib.error.URLError, OSError, ValueError):
+            resp = None
+        _record(results, time.perf_counter() - t0, args.chunk_s, resp)
+
+
+async def run_ws_client(url: str, session: str, audio: np.ndarray, args, results: Dict[str, Any]):
+    import websockets  # type: ignore
+
+    ws_url = url.replace("http", "ws", 1)
+    qs = f"session={session}&target={args.target}&caption_lang={args.caption_lang}&sample_rate={SAMPLE_RATE}&model={args.model}&timings=true"
+    try:
+        async with websockets.connect(f"{ws_url}/ws/pcm?{qs}", max_size=None) as ws:
+            async for _, chunk in _paced_chunks(audio, args.chunk_s, args.duration, not args.no_pace):
+                t0 = time.perf_counter()
+                await ws.send(chunk.astype(np.float32).tobytes())
+                resp = json.loads(await ws.recv())
+                _record(results, time.perf_counter() - t0, args.chunk_s, resp)
+                if resp.get("error") == "overloaded":
+                    break
+    except Exception as e:
+        results["errors"] += 1
+        results["last_error"] = str(e)
+
+
+CLIENTS = {"pcm": run_pcm_client, "ws": run_ws_client, "ingest": run_ingest_client}
+
+
+# ============================================================================
+# Reporting
+# ============================================================================
+
+def _pct(values: List[float], q: float) -> Optional[float]:
+    return round(float(np.percentile(values, q)) * 1000.0, 2) if values else None
+
+
+def summarize(results: Dict[str, Any], wall_s: float, chunk_s: float) -> Dict[str, Any]:
+    lat = results["latencies"]
+    return {
+        "chunks": len(lat),
+        "errors": results["errors"],
+        "rejected": results["rejected"],
+        "silent_chunks": results["silent"],
+        "segments": results["segments"],
+        "latency_ms": {
+            "p50": _pct(lat, 50), "p95": _pct(lat, 95), "p99": _pct(lat, 99),
+            "mean": round(float(np.mean(lat)) * 1000.0, 2) if lat else None,
+            "max": round(max(lat) * 1000.0, 2) if lat else None,
+        },
+        # processing time per second of audio; > 1.0 means the node cannot keep up
+        "real_time_factor": round(float(np.mean(lat)) / chunk_s, 3) if lat else None,
+        "throughput": {
+            "chunks_per_s": round(len(lat) / wall_s, 2) if wall_s else None,
+            "audio_s_per_s": round(results["audio_s"] / wall_s, 2) if wall_s else None,
+        },
+        "server_stage_ms_p50": {k: _pct([v / 1000.0 for v in vals], 50) for k, vals in sorted(results["server_stages"].items())},
+        **({"last_error": results["last_error"]} if "last_error" in results else {}),
+    }
+
+
+async def run_transport(transport: str, url: str, sources: List[np.ndarray], args, pid: Optional[int]) -> Dict[str, Any]:
+    results = {"latencies": [], "audio_s": 0.0, "errors": 0, "rejected": 0, "silent": 0, "segments": 0, "server_stages": {}}
+    rss = {"before": _rss_bytes(pid), "peak": _rss_bytes(pid)}
+    run_id = uuid.uuid4().hex[:8]
+
+    async def sample_memory():
+        while True:
+            cur = _rss_bytes(pid)
+            if cur and (rss["peak"] is None or cur > rss["peak"]):
+                rss["peak"] = cur
+            await asyncio.sleep(0.5)
+
+    sampler = asyncio.create_task(sample_memory())
+    t0 = time.perf_counter()
+    await asyncio.gather(*[
+        CLIENTS[transport](url, f"bench-{transport}-{run_id}-{i}", sources[i % len(sources)], args, results)
+        for i in range(args.sessions)
+    ])
+    wall = time.perf_counter() - t0
+    sampler.cancel()
+    rss["after"] = _rss_bytes(pid)
+    summary = summarize(results, wall, args.chunk_s)
+    summary["wall_s"] = round(wall, 2)
+    summary["server_rss_mb"] = {k: round(v / 2**20, 1) if v else None for k, v in rss.items()}
+    return summary
+
+
+def _git_rev() -> Optional[str]:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=os.path.dirname(os.path.abspath(__file__)), text=True).strip()
+    except Exception:
+        return None
+
+
+def print_report(report: Dict[str, Any], baseline: Optional[Dict[str, Any]] = None):
+    print("=" * 60)
+    print(f"Benchmark  rev={report['git_rev']}  sessions={report['config']['sessions']}  stub={report['config']['stub']}")
+    print("=" * 60)
+    for transport, res in report["results"].items():
+        lat = res["latency_ms"]
+        line = (f"{transport:7s} chunks={res['chunks']:5d} err={res['errors']:3d} rej={res.get('rejected', 0):3d} "
+                f"p50={lat['p50']}ms p95={lat['p95']}ms p99={lat['p99']}ms "
+                f"rtf={res['real_time_factor']} audio/s={res['throughput']['audio_s_per_s']} "
+                f"rss_peak={res['server_rss_mb']['peak']}MB")
+        print(line)
+        prev = (baseline or {}).get("results", {}).get(transport)
+        if prev:
+            for q in ("p50", "p95", "p99"):
+                a, b = prev["latency_ms"].get(q), lat.get(q)
+                if a and b:
+                    print(f"          {q}: {a} -> {b} ms ({(b - a) / a * 100:+.1f}%)")
+
+
+def parse_args(argv=None):
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--url", default="http://127.0.0.1:8000", help="server to benchmark (ignored with --spawn)")
+    p.add_argument("--spawn", action="store_true", help="start a local server on a free port")
+    p.add_argument("--stub", action="store_true", help="with --spawn: use stub model/translator/TTS backends")
+    p.add_argument("--transport", choices=TRANSPORTS + ("all",), default="all")
+    p.add_argument("--sessions", type=int, default=4, help="concurrent simulated sessions")
+    p.add_argument("--duration", type=float, default=15.0, help="seconds of audio per session")
+    p.add_argument("--chunk-s", type=float, default=0.5, help="chunk length in seconds")
+    p.add_argument("--no-pace", action="store_true", help="send as fast as possible instead of real time")
+    p.add_argument("--wav", nargs="*", default=[], help="WAV files to replay (round-robin across sessions)")
+    p.add_argument("--signal", choices=("tone", "noise", "mixed"), default="mixed", help="generated audio when no --wav")
+    p.add_argument("--target", default="es")
+    p.add_argument("--caption-lang", default="en")
+    p.add_argument("--model", default="small")
+    p.add_argument("--out", default=None, help="JSON output path (default bench_results/<timestamp>.json)")
+    p.add_argument("--compare", default=None, help="previous results JSON to diff against")
+    p.add_argument("--serve-stub", action="store_true", help=argparse.SUPPRESS)
+    p.add_argument("--port", type=int, default=8000, help=argparse.SUPPRESS)
+    return p.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.serve_stub:
+        serve_stub(args.port)
+        return
+
+    sources = [load_wav(p) for p in args.wav] or [generate_signal(args.signal, 30.0, seed=i) for i in range(4)]
+    transports = TRANSPORTS if args.transport == "all" else (args.transport,)
+
+    proc, url = (None, args.url)
+    if args.spawn:
+        proc, url = spawn_server(args.stub)
+    try:
+        results = {t: asyncio.run(run_transport(t, url, sources, args, proc.pid if proc else None)) for t in transports}
+    finally:
+        if proc:
+            proc.terminate()
+            try: proc.wait(timeout=10)
+            except Exception: proc.kill()
+
+    report = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "git_rev": _git_rev(),
+        "host": {"platform": platform.platform(), "python": platform.python_version(), "cpus": os.cpu_count()},
+        "config": {k: v for k, v in vars(args).items() if k not in ("serve_stub", "port", "compare")},
+        "results": results,
+    }
+    out = args.out or os.path.join("bench_results", f"bench_{time.strftime('%Y%m%d_%H%M%S')}.json")
+    os.makedirs(os.path.dirname(out) or ".", exist_ok=True)
+    with open(out, "w") as f:
+        json.dump(report, f, indent=2)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    print_report(report, baseline)
+    print(f"\nSaved results to {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -11,17 +11,21 @@ import struct
 import io
 import array
 import math
+import time
 import wave
-import numpy as np
-import soundfile as sf
+import threading
+import functools
+import contextvars
+import json
+import queue
+import urllib.parse
 from typing import List, Dict, Any, Set, Optional, Tuple
+from collections import deque
+from contextlib import contextmanager
 from concurrent.futures import ThreadPoolExecutor
 from fastapi import FastAPI, UploadFile, File, Query, Request, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, JSONResponse
-from faster_whisper import WhisperModel
-import argostranslate.translate as argos_translate
-import argostranslate.package
+from fastapi.responses import FileResponse, JSONResponse, PlainTextResponse, StreamingResponse
 
 logging.basicConfig(level=logging.INFO, format="[%(asctime)s] %(levelname)s: %(message)s")
 
@@ -35,10 +39,51 @@ WHISPER_COMPUTE_TYPE = os.environ.get("WHISPER_COMPUTE_TYPE", "int8")
 WHISPER_BEAM_SIZE = int(os.environ.get("WHISPER_BEAM_SIZE", "5"))
 WHISPER_TEMPS = [0.0, 0.2]  # Reduced from 0.0-1.0 to prevent hallucinations
 
-# Adaptive silence calibration
-SILENCE_CALIBRATION_DURATION = float(os.environ.get("SILENCE_CALIBRATION_DURATION", "1.5"))
+# CPU thread budgets per engine. Explicit values win; otherwise CPU_BUDGET is split
+# ~60% Whisper / 25% translation / 15% TTS so the engines do not oversubscribe.
+CPU_BUDGET = int(os.environ.get("CPU_BUDGET", "0")) or (os.cpu_count() or 4)
+WHISPER_NUM_WORKERS = max(1, int(os.environ.get("WHISPER_NUM_WORKERS", "1")))  # concurrent decodes on one model
+WHISPER_CPU_THREADS = int(os.environ.get("WHISPER_CPU_THREADS", "0")) or max(1, int(CPU_BUDGET * 0.6) // WHISPER_NUM_WORKERS)
+TRANSLATE_WORKERS = max(1, int(os.environ.get("TRANSLATE_WORKERS", "2")))
+TRANSLATE_THREADS = int(os.environ.get("TRANSLATE_THREADS", "0")) or max(1, int(CPU_BUDGET * 0.25) // TRANSLATE_WORKERS)
+TTS_WORKERS = max(1, int(os.environ.get("TTS_WORKERS", "1")))
+TTS_THREADS = int(os.environ.get("TTS_THREADS", "0")) or max(1, int(CPU_BUDGET * 0.15) // TTS_WORKERS)
+# Optional core pinning (Linux), e.g. WHISPER_CORES="0-19" TRANSLATE_CORES="20-27" TTS_CORES="28-31"
+WHISPER_CORES = os.environ.get("WHISPER_CORES", "")
+TRANSLATE_CORES = os.environ.get("TRANSLATE_CORES", "")
+TTS_CORES = os.environ.get("TTS_CORES", "")
+# argostranslate reads these when first imported
+os.environ.setdefault("ARGOS_INTER_THREADS", str(TRANSLATE_WORKERS))
+os.environ.setdefault("ARGOS_INTRA_THREADS", str(TRANSLATE_THREADS))
+
+# Per-session decoding context (prompt carry-over + language pinning)
+WHISPER_PROMPT_CHARS = int(os.environ.get("WHISPER_PROMPT_CHARS", "200"))
+LANG_PIN_CHUNKS = int(os.environ.get("LANG_PIN_CHUNKS", "3"))  # consecutive agreeing chunks
+LANG_PIN_MIN_PROB = float(os.environ.get("LANG_PIN_MIN_PROB", "0.8"))
+LANG_UNPIN_CHUNKS = int(os.environ.get("LANG_UNPIN_CHUNKS", "3"))  # consecutive poor decodes before re-detecting
+LANG_UNPIN_LOGPROB = float(os.environ.get("LANG_UNPIN_LOGPROB", "-1.0"))  # mean avg_logprob below this counts as poor
+
+# Adaptive silence gating: continuously tracked noise floor
+SILENCE_CALIBRATION_DURATION = float(os.environ.get("SILENCE_CALIBRATION_DURATION", "1.5"))  # audio before the first estimate
 SILENCE_MULTIPLIER = float(os.environ.get("SILENCE_MULTIPLIER", "1.5"))  # Lowered from 2.5
 MAX_SILENCE_THRESHOLD = 0.05  # Cap the threshold to avoid over-calibration
+MIN_SILENCE_THRESHOLD = float(os.environ.get("MIN_SILENCE_THRESHOLD", "0.002"))  # digital silence
+NOISE_FRAME_MS = int(os.environ.get("NOISE_FRAME_MS", "20"))
+NOISE_WINDOW_S = float(os.environ.get("NOISE_WINDOW_S", "5.0"))  # rolling window of frame energies
+NOISE_PERCENTILE = float(os.environ.get("NOISE_PERCENTILE", "10"))  # floor = this percentile of frame RMS
+VAD_HYSTERESIS = float(os.environ.get("VAD_HYSTERESIS", "0.7"))  # stay in speech down to threshold * this
+VAD_HANGOVER_S = float(os.environ.get("VAD_HANGOVER_S", "0.5"))  # keep decoding this long after speech ends
+
+# Hallucination / no-speech filter applied before translation and TTS
+FILTER_HALLUCINATIONS = os.environ.get("FILTER_HALLUCINATIONS", "1") == "1"
+FILTER_NO_SPEECH_PROB = float(os.environ.get("FILTER_NO_SPEECH_PROB", "0.6"))  # drop if above AND logprob below next
+FILTER_NO_SPEECH_LOGPROB = float(os.environ.get("FILTER_NO_SPEECH_LOGPROB", "-1.0"))
+FILTER_MIN_AVG_LOGPROB = float(os.environ.get("FILTER_MIN_AVG_LOGPROB", "-1.5"))
+FILTER_MAX_COMPRESSION_RATIO = float(os.environ.get("FILTER_MAX_COMPRESSION_RATIO", "2.4"))
+FILTER_NGRAM = int(os.environ.get("FILTER_NGRAM", "3"))
+FILTER_NGRAM_REPEATS = int(os.environ.get("FILTER_NGRAM_REPEATS", "3"))  # same n-gram this often within a segment
+FILTER_RECENT_OVERLAP = float(os.environ.get("FILTER_RECENT_OVERLAP", "0.8"))  # share of n-grams already in recent text
+FILTER_RECENT_MIN_NGRAMS = int(os.environ.get("FILTER_RECENT_MIN_NGRAMS", "4"))  # shorter segments are never "repeats"
 
 # Piper TTS configuration
 PIPER_BIN = os.environ.get("PIPER_BIN", "piper/piper.exe")
@@ -47,8 +92,45 @@ VOICE_MAP = {
     "es": os.environ.get("PIPER_VOICE_ES", "piper/voices/es_ES-ana-medium.onnx"),
 }
 
+# Session persistence: append-only JSONL log per session, group-committed off the event loop
+SESSION_PERSIST = os.environ.get("SESSION_PERSIST", "1") == "1"
+SESSION_LOG_DIR = os.environ.get("SESSION_LOG_DIR", "sessions")
+SESSION_LOG_FLUSH_S = float(os.environ.get("SESSION_LOG_FLUSH_S", "0.5"))
+SESSION_LOG_FSYNC = os.environ.get("SESSION_LOG_FSYNC", "0") == "1"
+SESSION_RECOVER_MAX_AGE_S = float(os.environ.get("SESSION_RECOVER_MAX_AGE_S", "21600"))  # only logs written this recently are replayed
+SESSION_LOG_RETENTION_S = float(os.environ.get("SESSION_LOG_RETENTION_S", "604800"))  # older logs are deleted; 0 keeps them
+
+# Admission control: refuse new streams once estimated decode capacity is used up
+DECODE_SLOTS = int(os.environ.get("DECODE_SLOTS", str(WHISPER_NUM_WORKERS)))  # decodes the node can run concurrently
+ADMISSION_MAX_STREAMS = int(os.environ.get("ADMISSION_MAX_STREAMS", "0"))  # 0 = no fixed cap
+ADMISSION_MAX_UTILIZATION = float(os.environ.get("ADMISSION_MAX_UTILIZATION", "0.85"))
+ADMISSION_RETRY_AFTER_S = int(os.environ.get("ADMISSION_RETRY_AFTER_S", "15"))
+ADMISSION_REDIRECT_URL = os.environ.get("ADMISSION_REDIRECT_URL", "")  # e.g. http://node-b:8000
+STREAM_IDLE_S = float(os.environ.get("STREAM_IDLE_S", "10"))  # HTTP stream counts toward capacity this long
+ADMISSION_SESSION_TTL_S = float(os.environ.get("ADMISSION_SESSION_TTL_S", "3600"))  # admitted sessions skip the gate this long after last activity
+ADMISSION_DEFAULT_RTF = float(os.environ.get("ADMISSION_DEFAULT_RTF", "0.5"))  # assumed until a decode is measured
+INGEST_RATE_PER_S = float(os.environ.get("INGEST_RATE_PER_S", "8"))  # per-session /ingest/pcm posts
+INGEST_RATE_BURST = float(os.environ.get("INGEST_RATE_BURST", "16"))
+
+# Subscriber fan-out: bounded per-viewer outbound queue
+SUBSCRIBER_QUEUE_SIZE = int(os.environ.get("SUBSCRIBER_QUEUE_SIZE", "16"))
+SUBSCRIBER_SEND_TIMEOUT = float(os.environ.get("SUBSCRIBER_SEND_TIMEOUT", "5.0"))
+
+# Warm-up: preload model/translators/voices before reporting ready on /ready
+WARMUP_ON_STARTUP = os.environ.get("WARMUP_ON_STARTUP", "1") == "1"
+PIVOT_LANG = os.environ.get("PIVOT_LANG", "en")  # intermediate for pairs without a direct Argos pack
+WARMUP_LANG_PAIRS = [
+    tuple(p.split(":", 1)) for p in os.environ.get("WARMUP_LANG_PAIRS", "en:es,es:en").split(",") if ":" in p
+]
+
+# Heavy modules are imported on first use (see _lazy_* below) to keep startup fast
+WhisperModel = None
+argos_translate = None
+argos_package = None
+
 _whisper_model = None
 sessions: Dict[str, Dict[str, Any]] = {}
+readiness: Dict[str, Any] = {"ready": not WARMUP_ON_STARTUP, "stage": "pending", "components": {}, "error": None}
 
 app = FastAPI()
 app.add_middleware(
@@ -59,6 +141,175 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# ============================================================================
+# Metrics
+# ============================================================================
+
+METRICS_PREFIX = "voiceconv"
+_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+_RTF_BUCKETS = (0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1.0, 1.5, 2.0, 5.0)
+
+
+def _escape_label(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class _Metrics:
+    """Minimal thread-safe histogram/counter registry rendered in Prometheus text format."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._hists: Dict[tuple, Dict[str, Any]] = {}
+        self._counters: Dict[tuple, float] = {}
+
+    @staticmethod
+    def _key(name: str, labels: Dict[str, str]) -> tuple:
+        return (name, tuple(sorted(labels.items())))
+
+    def observe(self, name: str, value: float, buckets: tuple = _LATENCY_BUCKETS, **labels):
+        key = self._key(name, labels)
+        with self._lock:
+            h = self._hists.get(key)
+            if h is None:
+                h = self._hists[key] = {"buckets": buckets, "counts": [0] * len(buckets), "sum": 0.0, "count": 0}
+            for i, le in enumerate(h["buckets"]):
+                if value <= le:
+                    h["counts"][i] += 1
+            h["sum"] += value
+            h["count"] += 1
+
+    def inc(self, name: str, value: float = 1.0, **labels):
+        key = self._key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0.0) + value
+
+    @staticmethod
+    def _fmt(name: str, labels, extra: str = "") -> str:
+        parts = [f'{k}="{_escape_label(v)}"' for k, v in labels] + ([extra] if extra else [])
+        return f"{METRICS_PREFIX}_{name}" + (f"{{{','.join(parts)}}}" if parts else "")
+
+    def render(self, gauges: Dict[str, float]) -> str:
+        lines: List[str] = []
+        with self._lock:
+            for (name, labels), h in sorted(self._hists.items()):
+                for le, c in zip(h["buckets"], h["counts"]):
+                    le_label = f'le="{le}"'
+                    lines.append(f"{self._fmt(name + '_bucket', labels, le_label)} {c}")
+                inf_label = 'le="+Inf"'
+                lines.append(f"{self._fmt(name + '_bucket', labels, inf_label)} {h['count']}")
+                lines.append(f"{self._fmt(name + '_sum', labels)} {h['sum']:.6f}")
+                lines.append(f"{self._fmt(name + '_count', labels)} {h['count']}")
+            for (name, labels), v in sorted(self._counters.items()):
+                lines.append(f"{self._fmt(name, labels)} {v:g}")
+        for name, v in sorted(gauges.items()):
+            lines.append(f"{self._fmt(name, ())} {v:g}")
+        return "\n".join(lines) + "\n"
+
+
+metrics = _Metrics()
+
+# Per-request stage timings, returned as `timings` when the caller asks for them
+_request_timings: contextvars.ContextVar[Optional[Dict[str, float]]] = contextvars.ContextVar("request_timings", default=None)
+_request_timings_lock = threading.Lock()  # pool threads of one request add to the same dict
+
+
+@contextmanager
+def _stage(name: str):
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - t0
+        metrics.observe("stage_duration_seconds", elapsed, stage=name)
+        timings = _request_timings.get()
+        if timings is not None:
+            with _request_timings_lock:
+                timings[name] = round(timings.get(name, 0.0) + elapsed * 1000.0, 2)
+
+
+def _timed(name: str):
+    def deco(fn):
+        if asyncio.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                with _stage(name):
+                    return await fn(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with _stage(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return deco
+
+
+# ============================================================================
+# CPU Resources
+# ============================================================================
+
+def _parse_cores(spec: str) -> Set[int]:
+    """'0-3,8,10-11' -> {0, 1, 2, 3, 8, 10, 11}"""
+    cores: Set[int] = set()
+    for part in spec.replace(" ", "").split(","):
+        if not part:
+            continue
+        lo, _, hi = part.partition("-")
+        cores.update(range(int(lo), int(hi or lo) + 1))
+    return cores
+
+
+def _pin_current_thread(spec: str):
+    """Restrict the calling thread (and threads it spawns) to `spec` cores; no-op off Linux."""
+    if spec and hasattr(os, "sched_setaffinity"):
+        try:
+            os.sched_setaffinity(0, _parse_cores(spec))
+        except Exception as e:
+            logging.warning(f"Could not pin thread to cores {spec}: {e}")
+
+
+@contextmanager
+def _pinned(spec: str):
+    """Temporarily pin the calling thread, e.g. while an engine creates its worker threads."""
+    if not spec or not hasattr(os, "sched_getaffinity"):
+        yield
+        return
+    previous = os.sched_getaffinity(0)
+    _pin_current_thread(spec)
+    try:
+        yield
+    finally:
+        os.sched_setaffinity(0, previous)
+
+
+_decode_executor = ThreadPoolExecutor(max_workers=WHISPER_NUM_WORKERS, thread_name_prefix="whisper", initializer=_pin_current_thread, initargs=(WHISPER_CORES,))
+_translate_executor = ThreadPoolExecutor(max_workers=TRANSLATE_WORKERS, thread_name_prefix="translate", initializer=_pin_current_thread, initargs=(TRANSLATE_CORES,))
+_tts_executor = ThreadPoolExecutor(max_workers=TTS_WORKERS, thread_name_prefix="tts")
+# Piper is pinned through taskset when present (no preexec_fn: unsafe in a threaded server)
+_TASKSET = shutil.which("taskset") if TTS_CORES and os.name == "posix" else None
+
+
+async def _run_in(executor: ThreadPoolExecutor, fn, *args, **kwargs):
+    """Await a blocking call on `executor`; the copied context keeps per-request timings."""
+    ctx = contextvars.copy_context()
+    return await asyncio.get_running_loop().run_in_executor(executor, functools.partial(ctx.run, fn, *args, **kwargs))
+
+
+async def _run_decode(fn, *args, **kwargs):
+    """Run a blocking decode on the Whisper executor (WHISPER_NUM_WORKERS at a time)."""
+    return await _run_in(_decode_executor, fn, *args, **kwargs)
+
+
+def resource_plan() -> Dict[str, Any]:
+    return {
+        "cpu_budget": CPU_BUDGET,
+        "whisper": {"num_workers": WHISPER_NUM_WORKERS, "cpu_threads": WHISPER_CPU_THREADS, "cores": WHISPER_CORES or None},
+        "translation": {"workers": TRANSLATE_WORKERS, "intra_threads": int(os.environ["ARGOS_INTRA_THREADS"]), "cores": TRANSLATE_CORES or None},
+        "tts": {"workers": TTS_WORKERS, "threads_per_process": TTS_THREADS, "cores": TTS_CORES or None},
+        "decode_slots": DECODE_SLOTS,
+    }
+
+
 # ============================================================================
 # Base Helpers
 # ============================================================================
@@ -66,37 +317,313 @@ app.add_middleware(
 def ensure_session(session_id: str) -> Dict[str, Any]:
     if session_id not in sessions:
         sessions[session_id] = {
+            "session_id": session_id,
             "segments": [],
             "pending_buf": None,
+            "segmenter": _SentenceSegmenter(),
+            "caption_locks": {},
+            "caption_live": {},  # lang -> (segmenter revision, pending caption)
             "accumulated_duration": 0.0,
-            "subscribers": set(),
-            "calibration_samples": [],
+            "subscribers": {},
+            "noise": {"frames": deque(maxlen=max(1, int(NOISE_WINDOW_S * 1000 / NOISE_FRAME_MS))), "in_speech": False, "hangover": 0.0},
             "baseline_rms": None,
             "adaptive_threshold": None,
+            "decode_ctx": {"language": None, "candidate": None, "streak": 0, "misses": 0},
+            "filtered": {},
+            "decode_lock": asyncio.Lock(),
         }
     return sessions[session_id]
 
 
+class _SessionLog:
+    """Append-only per-session JSONL log written by a background thread.
+
+    Records are queued from the ingest path and written in batches every
+    SESSION_LOG_FLUSH_S: one open/write/flush per session per batch, and state
+    records coalesced so only the latest per session is written. Each line is
+    either {"type": "segments", ...} or {"type": "state", ...}; `recover()`
+    replays them to rebuild `sessions` after a restart. Logs idle for longer
+    than `retention_s` are deleted at startup and hourly after that.
+    """
+
+    PRUNE_INTERVAL_S = 3600.0
+
+    def __init__(self, directory: str, flush_s: float, fsync: bool, recover_max_age_s: float, retention_s: float):
+        self.directory = directory
+        self.flush_s = flush_s
+        self.fsync = fsync
+        self.recover_max_age_s = recover_max_age_s
+        self.retention_s = retention_s
+        self._queue: "queue.Queue[Optional[tuple]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+
+    def _path(self, session_id: str) -> str:
+        return os.path.join(self.directory, urllib.parse.quote(session_id, safe="") + ".jsonl")
+
+    def start(self):
+        os.makedirs(self.directory, exist_ok=True)
+        self._thread = threading.Thread(target=self._run, name="session-log", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._thread:
+            self._queue.put(None)
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def record_segments(self, sess: Dict[str, Any], segs: List[Dict[str, Any]]):
+        if self._thread and segs:
+            self._queue.put((sess["session_id"], {"type": "segments", "segments": segs}))
+
+    def record_state(self, sess: Dict[str, Any]):
+        if self._thread:
+            self._queue.put((sess["session_id"], {
+                "type": "state",
+                "accumulated_duration": sess["accumulated_duration"],
+                "baseline_rms": sess["baseline_rms"],
+                "adaptive_threshold": sess["adaptive_threshold"],
+                "language": sess["decode_ctx"]["language"],
+            }))
+
+    def _run(self):
+        stopping = False
+        last_prune = time.monotonic()
+        while not stopping:
+            if time.monotonic() - last_prune >= self.PRUNE_INTERVAL_S:
+                self.prune()
+                last_prune = time.monotonic()
+            batch: Dict[str, List[Dict[str, Any]]] = {}
+            try:
+                item = self._queue.get(timeout=self.flush_s)
+            except queue.Empty:
+                continue
+            deadline = time.monotonic() + self.flush_s
+            while True:
+                if item is None:
+                    stopping = True
+                    break
+                sid, rec = item
+                records = batch.setdefault(sid, [])
+                if rec["type"] == "state" and records and records[-1]["type"] == "state":
+                    records[-1] = rec  # latest state wins
+                else:
+                    records.append(rec)
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+            self._write_batch(batch)
+
+    def _write_batch(self, batch: Dict[str, List[Dict[str, Any]]]):
+        t0 = time.perf_counter()
+        for sid, records in batch.items():
+            try:
+                with open(self._path(sid), "a", encoding="utf-8") as f:
+                    f.write("".join(json.dumps(r, ensure_ascii=False) + "\n" for r in records))
+                    f.flush()
+                    if self.fsync:
+                        os.fsync(f.fileno())
+            except Exception as e:
+                logging.error(f"Session log write failed for {sid}: {e}")
+        metrics.observe("session_log_batch_seconds", time.perf_counter() - t0)
+        metrics.inc("session_log_records_total", sum(len(r) for r in batch.values()))
+
+    def _log_ages(self) -> List[Tuple[str, float]]:
+        """(file name, seconds since last write) for every session log."""
+        now = time.time()
+        ages = []
+        for name in sorted(os.listdir(self.directory)):
+            if not name.endswith(".jsonl"):
+                continue
+            try:
+                ages.append((name, now - os.path.getmtime(os.path.join(self.directory, name))))
+            except OSError:
+                continue
+        return ages
+
+    def prune(self) -> int:
+        """Delete logs idle for longer than the retention period; returns the number removed."""
+        if not self.retention_s or not os.path.isdir(self.directory):
+            return 0
+        removed = 0
+        for name, age in self._log_ages():
+            if age > self.retention_s:
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                    removed += 1
+                except OSError as e:
+                    logging.warning(f"Could not remove old session log {name}: {e}")
+        if removed:
+            logging.info(f"Removed {removed} session log(s) older than {self.retention_s:.0f}s")
+        return removed
+
+    def recover(self) -> int:
+        """Rebuild recently active sessions from the log directory; returns the number recovered."""
+        if not os.path.isdir(self.directory):
+            return 0
+        self.prune()
+        count = 0
+        for name, age in self._log_ages():
+            if self.recover_max_age_s and age > self.recover_max_age_s:
+                continue  # stale: kept on disk until retention, but not loaded
+            sess = ensure_session(urllib.parse.unquote(name[:-len(".jsonl")]))
+            with open(os.path.join(self.directory, name), encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        rec = json.loads(line)
+                    except ValueError:
+                        continue  # torn last line from a crash mid-write
+                    if rec.get("type") == "segments":
+                        sess["segments"].extend(rec.get("segments") or [])
+                    elif rec.get("type") == "state":
+                        sess["accumulated_duration"] = rec.get("accumulated_duration", 0.0)
+                        sess["baseline_rms"] = rec.get("baseline_rms")
+                        sess["adaptive_threshold"] = rec.get("adaptive_threshold")
+                        sess["decode_ctx"]["language"] = rec.get("language")
+            count += 1
+        return count
+
+
+session_log = _SessionLog(SESSION_LOG_DIR, SESSION_LOG_FLUSH_S, SESSION_LOG_FSYNC, SESSION_RECOVER_MAX_AGE_S, SESSION_LOG_RETENTION_S)
+
+
+def _lazy_whisper_cls():
+    global WhisperModel
+    if WhisperModel is None:
+        from faster_whisper import WhisperModel as _WhisperModel
+        WhisperModel = _WhisperModel
+    return WhisperModel
+
+
+def _lazy_argos_translate():
+    global argos_translate
+    if argos_translate is None:
+        import argostranslate.translate as _argos_translate
+        argos_translate = _argos_translate
+    return argos_translate
+
+
+def _lazy_argos_package():
+    global argos_package
+    if argos_package is None:
+        import argostranslate.package as _argos_package
+        argos_package = _argos_package
+    return argos_package
+
+
 def ensure_argos_languages():
     logging.info("Argos Translate ready; install missing packs via setup_models.py if needed.")
 
 
-def translate_text(text: str, source_lang: str, target_lang: str) -> tuple[str, bool]:
+class _TranslationRouter:
+    """Routes language pairs over installed Argos packs: direct, else via PIVOT_LANG.
+
+    The pack graph is read once (at warm-up or first use) and routes are cached;
+    call `refresh()` after installing new packs.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pairs: Optional[Set[Tuple[str, str]]] = None
+        self._routes: Dict[Tuple[str, str], Optional[List[str]]] = {}
+
+    def refresh(self):
+        try:
+            pairs = {(p.from_code, p.to_code) for p in _lazy_argos_package().get_installed_packages()}
+        except Exception as e:
+            logging.warning(f"Could not read installed Argos packs ({e}); trying direct pairs only")
+            pairs = None
+        with self._lock:
+            self._pairs = pairs
+            self._routes = {}
+        logging.info(f"Translation router: {len(pairs) if pairs is not None else 'unknown'} installed pairs")
+
+    def route(self, src: str, dst: str) -> Optional[List[str]]:
+        """Language path from src to dst (e.g. ['ja', 'en', 'es']), or None if unreachable."""
+        if self._pairs is None and not self._routes:
+            self.refresh()
+        key = (src, dst)
+        if key in self._routes:
+            return self._routes[key]
+        pairs = self._pairs
+        if pairs is None or key in pairs:
+            path = [src, dst]
+        elif (src, PIVOT_LANG) in pairs and (PIVOT_LANG, dst) in pairs:
+            path = [src, PIVOT_LANG, dst]
+        else:
+            mids = sorted(b for a, b in pairs if a == src and (b, dst) in pairs)
+            path = [src, mids[0], dst] if mids else None
+        with self._lock:
+            self._routes[key] = path
+        return path
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {f"{a}-{b}": path for (a, b), path in tuple(self._routes.items())}
+
+    def languages(self) -> Optional[Set[str]]:
+        """Codes of every installed pack endpoint, or None when the packs are unknown."""
+        if self._pairs is None and not self._routes:
+            self.refresh()
+        pairs = self._pairs
+        return None if pairs is None else {code for pair in pairs for code in pair}
+
+
+translation_router = _TranslationRouter()
+
+
+def _known_caption_lang(lang: str) -> bool:
+    """Whether a client-supplied caption language is one this node can produce.
+
+    May load the pack list on first use; call it off the event loop.
+    """
+    if lang == "auto":
+        return True
+    known = translation_router.languages()
+    if known is None:  # packs unknown: accept anything shaped like a language code
+        return len(lang) <= 8 and lang.replace("-", "").isalpha() and lang.isascii()
+    return lang in known or lang in VOICE_MAP
+
+
+def translate_text(text: str, source_lang: str, target_lang: str, memo: Optional[Dict[tuple, str]] = None) -> tuple[str, bool]:
+    """Translate along the router's path. `memo` shares hop results between calls,
+    so target and caption translations routed through the same pivot translate
+    the intermediate only once."""
     if not text.strip():
         return "", False
     if source_lang == target_lang:
         return text, False
-    try:
-        out = argos_translate.translate(text, from_code=source_lang, to_code=target_lang)
-        if not out:
+    path = translation_router.route(source_lang, target_lang)
+    if path is None:
+        metrics.inc("translation_requests_total", route="missing")
+        return text, True
+    metrics.inc("translation_requests_total", route="direct" if len(path) == 2 else "pivot")
+    out = text
+    for a, b in zip(path, path[1:]):
+        key = (out, a, b)
+        if memo is not None and key in memo:
+            metrics.inc("cache_requests_total", cache="translation_hop", result="hit")
+            out = memo[key]
+            continue
+        if memo is not None:
+            metrics.inc("cache_requests_total", cache="translation_hop", result="miss")
+        try:
+            hop = _lazy_argos_translate().translate(out, from_code=a, to_code=b)
+        except Exception as e:
+            msg = str(e).lower()
+            missing = any(k in msg for k in ["no translation", "not found", "not available"])
+            return text, missing
+        if not hop:
             return text, True
-        return out, False
-    except Exception as e:
-        msg = str(e).lower()
-        missing = any(k in msg for k in ["no translation", "not found", "not available"])
-        return text, missing
+        if memo is not None:
+            memo[key] = hop
+        out = hop
+    return out, False
 
 
+@_timed("run_piper")
 def run_piper(text: str, lang: str, out_dir: str) -> str:
     voice = VOICE_MAP.get(lang)
     if not voice or not os.path.exists(voice):
@@ -105,7 +632,15 @@ def run_piper(text: str, lang: str, out_dir: str) -> str:
     out_path = os.path.join(out_dir, f"tts_{uuid.uuid4().hex}.wav")
     try:
         cmd = [PIPER_BIN, "--model", voice, "--output", out_path]
-        proc = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+        env = dict(os.environ, OMP_NUM_THREADS=str(TTS_THREADS))
+        if TTS_CORES and _TASKSET:
+            cmd = [_TASKSET, "-c", TTS_CORES.replace(" ", "")] + cmd  # pinned before Piper starts its threads
+        proc = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, env=env)
+        if TTS_CORES and not _TASKSET and hasattr(os, "sched_setaffinity"):
+            try:
+                os.sched_setaffinity(proc.pid, _parse_cores(TTS_CORES))
+            except OSError as e:
+                logging.warning(f"Could not pin Piper to cores {TTS_CORES}: {e}")
         proc.communicate(text)
         if proc.returncode == 0 and os.path.exists(out_path):
             return out_path
@@ -118,22 +653,35 @@ def run_piper(text: str, lang: str, out_dir: str) -> str:
 # Global state for model
 _whisper_model = None
 _current_model_name = None
+_model_lock = threading.Lock()
 
+@_timed("get_model")
 def get_model(model_name: str = None):
-    global _whisper_model, _current_model_name
-    
     # Default to env var if not specified
     target_model = model_name or WHISPER_MODEL_SIZE
     
     # If we already have the correct model loaded, return it
     if _whisper_model is not None and _current_model_name == target_model:
+        metrics.inc("cache_requests_total", cache="model", result="hit")
         return _whisper_model
+    with _model_lock:
+        # Another caller (e.g. warm-up) may have finished loading while we waited
+        if _whisper_model is not None and _current_model_name == target_model:
+            metrics.inc("cache_requests_total", cache="model", result="hit")
+            return _whisper_model
+        metrics.inc("cache_requests_total", cache="model", result="miss")
+        return _load_model(target_model)
+
+
+def _load_model(target_model: str):
+    global _whisper_model, _current_model_name
 
     logging.info(f"Switching Whisper model: {_current_model_name} -> {target_model}")
     
     # Unload previous model if exists
     if _whisper_model is not None:
-        del _whisper_model
+        _whisper_model = None
+        _current_model_name = None
         import gc
         gc.collect()
         if DEVICE == "cuda":
@@ -143,7 +691,11 @@ def get_model(model_name: str = None):
     # Load new model
     try:
         compute_type = WHISPER_COMPUTE_TYPE or ("float16" if DEVICE in ("cuda", "auto") else "int8")
-        _whisper_model = WhisperModel(target_model, device=DEVICE, compute_type=compute_type)
+        with _pinned(WHISPER_CORES):  # CTranslate2 worker threads inherit the affinity
+            _whisper_model = _lazy_whisper_cls()(
+                target_model, device=DEVICE, compute_type=compute_type,
+                cpu_threads=WHISPER_CPU_THREADS, num_workers=WHISPER_NUM_WORKERS,
+            )
         _current_model_name = target_model
         logging.info(f"Model {target_model} loaded successfully.")
     except Exception as e:
@@ -151,25 +703,173 @@ def get_model(model_name: str = None):
         # Fallback to small if custom fails
         if target_model != "small":
             logging.info("Falling back to 'small' model...")
-            return get_model("small")
+            return _load_model("small")
         raise e
 
     return _whisper_model
 
 
-async def _broadcast_segments(session_id: str, payload: Dict[str, Any]):
-    sess = ensure_session(session_id)
-    dead: Set[WebSocket] = set()
-    for ws in tuple(sess.get("subscribers", set())):
-        try:
-            await ws.send_json(payload)
-        except Exception:
-            dead.add(ws)
-    for ws in dead:
+class _Subscriber:
+    """Outbound queue + writer task for one `/ws/{session_id}` viewer.
+
+    When the queue is full the oldest payload is dropped and its finalized
+    `newSegments` are coalesced into the next queued payload, so slow viewers
+    skip stale live text but never lose sentences.
+    """
+
+    def __init__(self, ws: WebSocket, caption_lang: Optional[str] = None, maxsize: int = SUBSCRIBER_QUEUE_SIZE):
+        self.ws = ws
+        self.caption_lang = caption_lang  # None: whatever the ingesting client asked for
+        self.maxsize = max(1, maxsize)
+        self.queue: deque = deque()
+        self.ready = asyncio.Event()
+        self.task: Optional[asyncio.Task] = None
+        self.closed = False
+        self.sent = 0
+        self.dropped = 0
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+
+    def start(self):
+        self.task = asyncio.create_task(self._writer())
+
+    def enqueue(self, payload: Dict[str, Any]):
+        if self.closed:
+            return
+        if len(self.queue) >= self.maxsize:
+            _, oldest = self.queue.popleft()
+            self.dropped += 1
+            carried = oldest.get("newSegments") or []
+            if carried:
+                if self.queue:
+                    ts, nxt = self.queue[0]
+                    self.queue[0] = (ts, {**nxt, "newSegments": carried + (nxt.get("newSegments") or [])})
+                else:
+                    payload = {**payload, "newSegments": carried + (payload.get("newSegments") or [])}
+        self.queue.append((time.monotonic(), payload))
+        self.ready.set()
+
+    def stats(self) -> Dict[str, Any]:
+        oldest = self.queue[0][0] if self.queue else None
+        return {
+            "caption_lang": self.caption_lang,
+            "queued": len(self.queue),
+            "sent": self.sent,
+            "dropped": self.dropped,
+            "lag_s": round(time.monotonic() - oldest, 3) if oldest is not None else 0.0,
+            "last_lag_s": round(self.last_lag, 3),
+            "max_lag_s": round(self.max_lag, 3),
+        }
+
+    async def _writer(self):
         try:
-            sess["subscribers"].discard(ws)
-        except Exception:
+            while not self.closed:
+                if not self.queue:
+                    self.ready.clear()
+                    await self.ready.wait()
+                    continue
+                enqueued_at, payload = self.queue.popleft()
+                await asyncio.wait_for(self.ws.send_json(payload), timeout=SUBSCRIBER_SEND_TIMEOUT)
+                self.sent += 1
+                self.last_lag = time.monotonic() - enqueued_at
+                self.max_lag = max(self.max_lag, self.last_lag)
+        except asyncio.CancelledError:
             pass
+        except Exception as e:
+            logging.info(f"Subscriber writer stopped: {e}")
+            try: await self.ws.close()
+            except Exception: pass
+        finally:
+            self.closed = True
+            self.queue.clear()
+
+    def stop(self):
+        self.closed = True
+        if self.task and not self.task.done():
+            self.task.cancel()
+
+
+# Strong references to fire-and-forget tasks, so they are not collected mid-run
+_background_tasks: Set[asyncio.Task] = set()
+
+
+def _spawn(coro) -> asyncio.Task:
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    return task
+
+
+@_timed("broadcast")
+def _broadcast_segments(session_id: str, payload: Dict[str, Any], *, caption_lang: Optional[str] = None):
+    """Enqueue payload for every subscriber; returns without waiting on any send.
+
+    Subscribers that asked for a different caption language than the ingesting
+    client (`caption_lang`) are grouped by language; each language is rendered
+    once off the event loop and shared by all of its viewers.
+    """
+    sess = ensure_session(session_id)
+    subscribers = sess.get("subscribers", {})
+    by_lang: Dict[str, List[_Subscriber]] = {}
+    for ws, sub in tuple(subscribers.items()):
+        if sub.closed:
+            subscribers.pop(ws, None)
+            continue
+        if sub.caption_lang in (None, caption_lang):
+            sub.enqueue(payload)
+        else:
+            by_lang.setdefault(sub.caption_lang, []).append(sub)
+
+    locks: Dict[str, asyncio.Lock] = sess["caption_locks"]
+    for lang in [l for l, lock in locks.items() if l not in by_lang and not lock.locked()]:
+        del locks[lang]  # nobody is watching this language any more
+        sess["caption_live"].pop(lang, None)
+    segmenter = sess["segmenter"]
+    for lang, subs in by_lang.items():
+        lock = locks.setdefault(lang, asyncio.Lock())
+        _spawn(_fan_out_caption_language(sess, payload, segmenter.pending, segmenter.revision, lang, subs, lock))
+
+
+async def _fan_out_caption_language(sess: Dict[str, Any], payload: Dict[str, Any], pending: Optional[Dict[str, Any]], revision: int, lang: str, subs: List["_Subscriber"], lock: asyncio.Lock):
+    # The per-language lock keeps payloads in broadcast order
+    async with lock:
+        # The pending sentence is only re-translated when the segmenter moved on
+        cached = sess["caption_live"].get(lang)
+        live_caption = cached[1] if pending and cached and cached[0] == revision else None
+        if pending:
+            metrics.inc("cache_requests_total", cache="caption_live", result="hit" if live_caption is not None else "miss")
+        try:
+            localized = await _run_in(_translate_executor, _localize_payload, payload, pending, lang, live_caption)
+        except Exception as e:
+            logging.error(f"Caption fan-out to '{lang}' failed: {e}")
+            return
+        if pending:
+            sess["caption_live"][lang] = (revision, localized["liveCaption"])
+        metrics.inc("caption_fanout_total", lang=lang)
+        for sub in subs:
+            sub.enqueue(localized)
+
+
+def _caption_in(seg: Dict[str, Any], lang: str) -> str:
+    src = seg.get("detected_lang", "en")
+    txt = seg.get("text", "")
+    if lang == "auto" or lang == src:
+        return txt
+    return translate_text(txt, src, lang)[0]
+
+
+def _localize_payload(payload: Dict[str, Any], pending: Optional[Dict[str, Any]], lang: str, live_caption: Optional[str] = None) -> Dict[str, Any]:
+    """Copy of a broadcast payload with caption fields translated into `lang`.
+
+    `live_caption` is the already-translated pending sentence, when cached.
+    """
+    segs = [{**seg, "caption_text": _caption_in(seg, lang)} for seg in payload.get("newSegments") or []]
+    if pending:
+        if live_caption is None:
+            live_caption = _caption_in(pending, lang)
+    else:
+        live_caption = segs[-1]["caption_text"] if segs else ""
+    return {**payload, "newSegments": segs, "liveCaption": live_caption, "captionLang": lang}
 
 
 async def _write_temp(data: bytes) -> str:
@@ -185,8 +885,70 @@ async def _write_temp(data: bytes) -> str:
 # Transcription Logic (Advanced Features)
 # ============================================================================
 
-def _model_transcribe(model, path: str, word_timestamps: bool = False, beam_size: Optional[int] = None, temperature: Optional[float] = None):
-    """Transcribe with configurable word timestamps, beam size, and temperature."""
+def _decode_context_kwargs(sess: dict) -> Dict[str, Any]:
+    """Build `language`/`initial_prompt` from the session's recent source text."""
+    ctx = sess["decode_ctx"]
+    kwargs: Dict[str, Any] = {}
+    if ctx["language"]:
+        kwargs["language"] = ctx["language"]
+    parts = [seg.get("text", "") for seg in sess["segments"][-3:]]
+    pending = sess.get("pending_buf")
+    if pending:
+        parts.append(pending.get("text", ""))
+    prompt = " ".join(p for p in parts if p).strip()
+    if len(prompt) > WHISPER_PROMPT_CHARS:
+        prompt = prompt[-WHISPER_PROMPT_CHARS:]
+        prompt = prompt.split(" ", 1)[-1] if " " in prompt else prompt
+    if prompt:
+        kwargs["initial_prompt"] = prompt
+    return kwargs
+
+
+def _update_decode_context(sess: dict, segs: List, lang: str, info) -> None:
+    """Pin the session language once detection agrees for LANG_PIN_CHUNKS chunks.
+
+    A pinned language is dropped again after LANG_UNPIN_CHUNKS consecutive
+    empty or low-confidence decodes, so a wrong early pin or a speaker who
+    switches language goes back to detection.
+    """
+    ctx = sess["decode_ctx"]
+    if info is None:
+        return
+    if ctx["language"]:
+        logprobs = [s.avg_logprob for s in segs if getattr(s, "avg_logprob", None) is not None]
+        poor = not segs or (bool(logprobs) and sum(logprobs) / len(logprobs) < LANG_UNPIN_LOGPROB)
+        ctx["misses"] = ctx["misses"] + 1 if poor else 0
+        if ctx["misses"] >= LANG_UNPIN_CHUNKS:
+            logging.info(f"Unpinned session language '{ctx['language']}' after {ctx['misses']} poor decodes")
+            _reset_decode_language(sess)
+        return
+    if not segs:
+        return
+    prob = float(getattr(info, 'language_probability', 0.0) or 0.0)
+    if prob < LANG_PIN_MIN_PROB:
+        ctx["candidate"], ctx["streak"] = None, 0
+        return
+    if lang == ctx["candidate"]:
+        ctx["streak"] += 1
+    else:
+        ctx["candidate"], ctx["streak"] = lang, 1
+    if ctx["streak"] >= LANG_PIN_CHUNKS:
+        ctx["language"] = lang
+        logging.info(f"Pinned session language to '{lang}' (p={prob:.2f})")
+
+
+def _reset_decode_language(sess: dict, language: Optional[str] = None) -> None:
+    """Pin `language`, or with None go back to per-chunk detection."""
+    sess["decode_ctx"].update(language=language, candidate=None, streak=0, misses=0)
+
+
+@_timed("transcribe")
+def _model_transcribe(model, path: str, word_timestamps: bool = False, beam_size: Optional[int] = None, temperature: Optional[float] = None, language: Optional[str] = None, initial_prompt: Optional[str] = None, record_rtf: bool = True):
+    """Transcribe with configurable word timestamps, beam size, temperature and decoding context.
+
+    record_rtf=False keeps the decode out of the RTF metrics and admission
+    estimate (used by warm-up, whose cold-start timing is not representative).
+    """
     try:
         logging.info(f"[DEBUG] Starting transcription of {path}")
         kwargs = {
@@ -196,24 +958,34 @@ def _model_transcribe(model, path: str, word_timestamps: bool = False, beam_size
         }
         if temperature is not None:
             kwargs["temperature"] = temperature
+        if language:
+            kwargs["language"] = language  # skips language detection
+        if initial_prompt:
+            kwargs["initial_prompt"] = initial_prompt
         
+        t0 = time.perf_counter()
         segments, info = model.transcribe(path, **kwargs)
-        lang = getattr(info, 'language', 'en')
+        lang = getattr(info, 'language', None) or language or 'en'
         logging.info(f"[DEBUG] Transcription complete, lang={lang}, iterating segments...")
         segs = list(segments) if segments else []
+        duration = float(getattr(info, 'duration', 0.0) or 0.0)
+        if duration > 0 and record_rtf:
+            rtf = (time.perf_counter() - t0) / duration
+            metrics.observe("whisper_realtime_factor", rtf, buckets=_RTF_BUCKETS)
+            admission.observe_rtf(rtf)
         logging.info(f"[DEBUG] Got {len(segs)} segments")
         for i, s in enumerate(segs):
             logging.info(f"[DEBUG] Segment {i}: {getattr(s, 'text', '')}")
         return segs, lang, info
     except Exception as e:
         logging.error(f"[DEBUG] Transcribe error: {e}", exc_info=True)
-        return [], 'en', None
+        return [], language or 'en', None
 
 
-def _model_transcribe_with_temp_fallback(model, path: str, word_timestamps: bool = False, beam_size: Optional[int] = None) -> Tuple[List, str, Any]:
+def _model_transcribe_with_temp_fallback(model, path: str, word_timestamps: bool = False, beam_size: Optional[int] = None, **context) -> Tuple[List, str, Any]:
     """Try multiple temperatures if initial decode fails or returns low confidence."""
     for temp in WHISPER_TEMPS:
-        segs, lang, info = _model_transcribe(model, path, word_timestamps=word_timestamps, beam_size=beam_size, temperature=temp)
+        segs, lang, info = _model_transcribe(model, path, word_timestamps=word_timestamps, beam_size=beam_size, temperature=temp, **context)
         if segs:
             # Check if we got reasonable output
             if len(segs) > 0:
@@ -236,22 +1008,39 @@ def _ffmpeg_decode_to_wav(src: str, dst: str):
         raise RuntimeError(proc.stderr.decode(errors="ignore")[:200])
 
 
-def _try_transcribe_with_fallback(model, path: str, *, keep: bool = False, word_timestamps: bool = False, beam_size: Optional[int] = None, use_temp_fallback: bool = True):
-    """Try transcription with optional ffmpeg fallback and temperature fallback."""
+def _transcribe_with_model(model_name: Optional[str], path: str, **kwargs):
+    """Resolve the model and transcribe; the unit of work run on the decode executor."""
+    return _try_transcribe_with_fallback(get_model(model_name), path, **kwargs)
+
+
+def _try_transcribe_with_fallback(model, path: str, *, keep: bool = False, word_timestamps: bool = False, beam_size: Optional[int] = None, use_temp_fallback: bool = True, sess: Optional[dict] = None):
+    """Try transcription with optional ffmpeg fallback and temperature fallback.
+
+    When `sess` is given, recent session text is passed as `initial_prompt` and a
+    pinned language skips detection; the result feeds back into language pinning.
+    """
+    context = _decode_context_kwargs(sess) if sess is not None else {}
+    segs, lang, info = _transcribe_path(model, path, keep=keep, word_timestamps=word_timestamps, beam_size=beam_size, use_temp_fallback=use_temp_fallback, **context)
+    if sess is not None:
+        _update_decode_context(sess, segs, lang, info)
+    return segs, lang, info
+
+
+def _transcribe_path(model, path: str, *, keep: bool, word_timestamps: bool, beam_size: Optional[int], use_temp_fallback: bool, **context):
     try:
         if use_temp_fallback:
-            return _model_transcribe_with_temp_fallback(model, path, word_timestamps=word_timestamps, beam_size=beam_size)
+            return _model_transcribe_with_temp_fallback(model, path, word_timestamps=word_timestamps, beam_size=beam_size, **context)
         else:
-            segs, lang, info = _model_transcribe(model, path, word_timestamps=word_timestamps, beam_size=beam_size)
+            segs, lang, info = _model_transcribe(model, path, word_timestamps=word_timestamps, beam_size=beam_size, **context)
             return segs, lang, info
     except Exception:
         wav = path + ".wav"
         try:
             _ffmpeg_decode_to_wav(path, wav)
             if use_temp_fallback:
-                return _model_transcribe_with_temp_fallback(model, wav, word_timestamps=word_timestamps, beam_size=beam_size)
+                return _model_transcribe_with_temp_fallback(model, wav, word_timestamps=word_timestamps, beam_size=beam_size, **context)
             else:
-                segs, lang, info = _model_transcribe(model, wav, word_timestamps=word_timestamps, beam_size=beam_size)
+                segs, lang, info = _model_transcribe(model, wav, word_timestamps=word_timestamps, beam_size=beam_size, **context)
                 return segs, lang, info
         finally:
             if not keep and os.path.exists(wav):
@@ -297,27 +1086,126 @@ def _process_transcribed_segments(segments, lang: str) -> List[Dict[str, Any]]:
     return out
 
 
-def _merge_segments_into_sentences(segs: List[Dict[str, Any]], gap_s: float = 0.6, force_flush_len: int = 120) -> List[Dict[str, Any]]:
-    if not segs: return []
-    end_marks = (".", "?", "!", "…", "。", "？", "！")
-    def ends_sentence(t: str) -> bool: return t.strip().endswith(end_marks)
-    merged: List[Dict[str, Any]] = []
-    buf: Dict[str, Any] | None = None
-    for seg in segs:
-        if buf is None:
-            buf = seg.copy(); continue
-        gap = seg["start"] - buf["end"]
-        if gap > gap_s or ends_sentence(buf["text"]) or len(buf["text"]) >= force_flush_len:
-            merged.append(buf); buf = seg.copy(); continue
-        buf["text"] = f"{buf['text']} {seg['text']}".strip()
-        buf["end"] = seg["end"]
-        if ends_sentence(buf["text"]):
-            merged.append(buf); buf = None
-    if buf: merged.append(buf)
-    return merged
-
-
-def _apply_target_translation(segs: List[Dict[str, Any]], target: str):
+def _ngrams(words: List[str], n: int) -> List[tuple]:
+    return [tuple(words[i:i + n]) for i in range(len(words) - n + 1)]
+
+
+def _words(text: str) -> List[str]:
+    return [w.strip(".,!?…。？！\"'").lower() for w in text.split() if w.strip(".,!?…。？！\"'")]
+
+
+def _hallucination_reason(seg: Dict[str, Any], recent_ngrams: Set[tuple]) -> Optional[str]:
+    no_speech = seg.get("no_speech_prob")
+    logprob = seg.get("avg_logprob")
+    if no_speech is not None and logprob is not None and no_speech > FILTER_NO_SPEECH_PROB and logprob < FILTER_NO_SPEECH_LOGPROB:
+        return "no_speech"
+    if logprob is not None and logprob < FILTER_MIN_AVG_LOGPROB:
+        return "low_logprob"
+    if seg.get("compression_ratio", 0.0) > FILTER_MAX_COMPRESSION_RATIO:
+        return "compression_ratio"
+    grams = _ngrams(_words(seg.get("text", "")), FILTER_NGRAM)
+    if grams:
+        counts: Dict[tuple, int] = {}
+        for g in grams:
+            counts[g] = counts.get(g, 0) + 1
+        if max(counts.values()) >= FILTER_NGRAM_REPEATS:
+            return "repeated_ngram"
+        # Short real replies ("I don't know.") easily share a phrase with recent text
+        if recent_ngrams and len(grams) >= FILTER_RECENT_MIN_NGRAMS and sum(g in recent_ngrams for g in grams) / len(grams) >= FILTER_RECENT_OVERLAP:
+            return "repeats_recent"
+    return None
+
+
+def _filter_hallucinations(raw: List[Dict[str, Any]], sess: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Drop likely Whisper hallucinations before they are translated, voiced and broadcast.
+
+    Uses the segment's own confidence (no_speech_prob, avg_logprob,
+    compression_ratio), in-segment n-gram loops, and n-gram overlap with the
+    session's recent text. Counts go to `sess["filtered"]` and /metrics.
+    """
+    if not FILTER_HALLUCINATIONS or not raw:
+        return raw
+    recent = [seg.get("text", "") for seg in sess["segments"][-5:]]
+    if sess.get("pending_buf"):
+        recent.append(sess["pending_buf"].get("text", ""))
+    recent_ngrams = {g for t in recent for g in _ngrams(_words(t), FILTER_NGRAM)}
+    kept: List[Dict[str, Any]] = []
+    for seg in raw:
+        reason = _hallucination_reason(seg, recent_ngrams)
+        if reason is None:
+            kept.append(seg)
+            recent_ngrams.update(_ngrams(_words(seg.get("text", "")), FILTER_NGRAM))
+            continue
+        sess["filtered"][reason] = sess["filtered"].get(reason, 0) + 1
+        metrics.inc("filtered_segments_total", reason=reason)
+        metrics.inc("filtered_audio_seconds_total", max(0.0, seg.get("end", 0.0) - seg.get("start", 0.0)))
+        logging.info(f"Filtered segment ({reason}): {seg.get('text', '')[:60]!r}")
+    return kept
+
+
+SENTENCE_END_MARKS = (".", "?", "!", "…", "。", "？", "！")
+
+
+class _SentenceSegmenter:
+    """Incremental sentence merger holding a session's pending (incomplete) sentence.
+
+    `append` only walks the new segments, so per-chunk cost stays flat however
+    long the session runs. `revision` bumps whenever the pending tail changes,
+    which lets the live translation below be reused across silent chunks.
+    """
+
+    def __init__(self, gap_s: float = 0.6, force_flush_len: int = 120):
+        self.gap_s = gap_s
+        self.force_flush_len = force_flush_len
+        self.pending: Optional[Dict[str, Any]] = None
+        self.revision = 0
+        self._live_key: Optional[tuple] = None
+        self._live_bundle: Optional[Dict[str, str]] = None
+
+    @staticmethod
+    def _ends_sentence(text: str) -> bool:
+        return text.rstrip().endswith(SENTENCE_END_MARKS)
+
+    def append(self, segs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Feed new segments; return sentences completed by them."""
+        if not segs:
+            return []
+        completed: List[Dict[str, Any]] = []
+        buf = self.pending
+        for seg in segs:
+            if buf is None:
+                buf = seg; continue
+            gap = seg["start"] - buf["end"]
+            if gap > self.gap_s or self._ends_sentence(buf["text"]) or len(buf["text"]) >= self.force_flush_len:
+                completed.append(buf); buf = seg; continue
+            # A new dict, not in-place: earlier snapshots of `pending` (queued
+            # caption fan-outs) must keep the text of their revision
+            buf = {**buf, "text": f"{buf['text']} {seg['text']}".strip(), "end": seg["end"]}
+            if buf.get("words") or seg.get("words"):
+                buf["words"] = [*(buf.get("words") or []), *(seg.get("words") or [])]
+            if self._ends_sentence(buf["text"]):
+                completed.append(buf); buf = None
+        if buf is not None and self._ends_sentence(buf["text"]):
+            completed.append(buf); buf = None
+        self.pending = buf
+        self.revision += 1
+        return completed
+
+    async def live_bundle(self, key: tuple, compute) -> Dict[str, str]:
+        """Return the cached live bundle for (revision, *key), awaiting `compute` on change."""
+        full_key = (self.revision, *key)
+        if self._live_key == full_key:
+            metrics.inc("cache_requests_total", cache="live_translation", result="hit")
+            return self._live_bundle
+        metrics.inc("cache_requests_total", cache="live_translation", result="miss")
+        bundle = await compute(self.pending)
+        # Stored under the key it was computed for, even if the tail moved meanwhile
+        self._live_bundle, self._live_key = bundle, full_key
+        return bundle
+
+
+@_timed("target_translation")
+async def _apply_target_translation(segs: List[Dict[str, Any]], target: str, memo: Optional[Dict[tuple, str]] = None):
     if not segs: return
     tasks = []
     for i, seg in enumerate(segs):
@@ -327,13 +1215,13 @@ def _apply_target_translation(segs: List[Dict[str, Any]], target: str):
         if not txt.strip(): seg["translated"] = ""; continue
         if src == eff: seg["translated"] = txt
         else: tasks.append((i, txt, src, eff))
-    def _do(t): idx, txt, s, d = t; out,_ = translate_text(txt, s, d); return idx, out
+    def _do(t): idx, txt, s, d = t; out,_ = translate_text(txt, s, d, memo); return idx, out
     if tasks:
-        with ThreadPoolExecutor(max_workers=min(4, len(tasks))) as ex:
-            for idx, out in ex.map(_do, tasks): segs[idx]["translated"] = out
+        for idx, out in await asyncio.gather(*(_run_in(_translate_executor, _do, t) for t in tasks)): segs[idx]["translated"] = out
 
 
-def _apply_caption_language(segs: List[Dict[str, Any]], target: str, caption_lang: str) -> bool:
+@_timed("caption_translation")
+async def _apply_caption_language(segs: List[Dict[str, Any]], target: str, caption_lang: str, memo: Optional[Dict[tuple, str]] = None) -> bool:
     missing = False
     tasks = []
     for i, seg in enumerate(segs):
@@ -342,44 +1230,46 @@ def _apply_caption_language(segs: List[Dict[str, Any]], target: str, caption_lan
         if caption_lang == 'auto': seg["caption_text"] = seg.get("text", ""); continue
         if caption_lang == eff: seg["caption_text"] = seg.get("translated", seg.get("text", "")); continue
         if caption_lang == src: seg["caption_text"] = seg.get("text", ""); continue
-        base = seg.get("translated", seg.get("text", ""))
-        tasks.append((i, base, eff, caption_lang))
-    def _do(t): idx, txt, s, d = t; out, miss = translate_text(txt, s, d); return idx, out, miss
+        # From the source text, so a shared pivot hop is reused from `memo`
+        tasks.append((i, seg.get("text", ""), src, caption_lang))
+    def _do(t): idx, txt, s, d = t; out, miss = translate_text(txt, s, d, memo); return idx, out, miss
     if tasks:
-        with ThreadPoolExecutor(max_workers=min(4, len(tasks))) as ex:
-            for idx, out, miss in ex.map(_do, tasks): segs[idx]["caption_text"] = out; missing = missing or miss
+        for idx, out, miss in await asyncio.gather(*(_run_in(_translate_executor, _do, t) for t in tasks)): segs[idx]["caption_text"] = out; missing = missing or miss
     return missing
 
 
-def _finalize_segments(raw: List[Dict[str, Any]], sess: Dict[str, Any], *, target: str, caption_lang: str, offset: float = 0.0) -> tuple[List[Dict[str, Any]], bool]:
+async def _finalize_segments(raw: List[Dict[str, Any]], sess: Dict[str, Any], *, target: str, caption_lang: str, offset: float = 0.0) -> tuple[List[Dict[str, Any]], bool]:
     for seg in raw:
         seg["start"] = float(seg.get("start", 0.0)) + offset
         seg["end"] = float(seg.get("end", 0.0)) + offset
-    pending = sess.get("pending_buf")
-    combined = ([] if not pending else [pending]) + raw
-    merged = _merge_segments_into_sentences(combined)
-    end_marks = (".", "?", "!", "…", "。", "？", "！")
-    def complete(t: str) -> bool: return t.strip().endswith(end_marks)
-    completed = merged; new_pending = None
-    if merged:
-        last = merged[-1]
-        if not complete(last.get("text", "")):
-            new_pending = last; completed = merged[:-1]
-    _apply_target_translation(completed, target)
-    missing_pack = _apply_caption_language(completed, target, caption_lang)
-    if completed: sess["segments"].extend(completed)
-    sess["pending_buf"] = new_pending
+    completed = sess["segmenter"].append(raw)
+    memo: Dict[tuple, str] = {}
+    await _apply_target_translation(completed, target, memo)
+    missing_pack = await _apply_caption_language(completed, target, caption_lang, memo)
+    if completed:
+        sess["segments"].extend(completed)
+        session_log.record_segments(sess, completed)
+    sess["pending_buf"] = sess["segmenter"].pending
     return completed, missing_pack
 
 
-def _compute_live_from_pending(pending: Dict[str, Any] | None, *, target: str, caption_lang: str) -> Dict[str, str]:
+async def _compute_live_from_pending(sess: Dict[str, Any], *, target: str, caption_lang: str) -> Dict[str, str]:
+    """Live bundle for the pending sentence; only re-translated when the tail changed."""
+    return await sess["segmenter"].live_bundle(
+        (target, caption_lang),
+        lambda pending: _run_in(_translate_executor, _translate_pending, pending, target=target, caption_lang=caption_lang),
+    )
+
+
+def _translate_pending(pending: Dict[str, Any] | None, *, target: str, caption_lang: str) -> Dict[str, str]:
     if not pending: return {"liveText": "", "liveTranslated": "", "liveCaption": ""}
     src = pending.get("detected_lang", "en")
     txt = pending.get("text", "")
     
     # Translate to target language (or keep if auto/same)
     eff = src if target == "auto" else target
-    translated = txt if src == eff else translate_text(txt, src, eff)[0]
+    memo: Dict[tuple, str] = {}
+    translated = txt if src == eff else translate_text(txt, src, eff, memo)[0]
     
     # ALWAYS translate to caption_lang (English) if different from source
     if src == caption_lang:
@@ -387,22 +1277,19 @@ def _compute_live_from_pending(pending: Dict[str, Any] | None, *, target: str, c
     elif caption_lang == 'auto':
         caption = txt  # Auto means show original
     else:
-        # Translate from source language directly to caption_lang (English)
-        caption, _ = translate_text(txt, src, caption_lang)
+        # Translate from source language to caption_lang (English)
+        caption, _ = translate_text(txt, src, caption_lang, memo)
     
     logging.info(f"[CAPTION DEBUG] src={src}, caption_lang={caption_lang}, txt[:30]='{txt[:30] if txt else ''}', caption[:30]='{caption[:30] if caption else ''}'")
     return {"liveText": txt, "liveTranslated": translated, "liveCaption": caption}
 
 
-def _maybe_synthesize_tts(segs: List[Dict[str, Any]], target: str, session: str) -> List[str]:
-    urls = []
+async def _maybe_synthesize_tts(segs: List[Dict[str, Any]], target: str, session: str) -> List[str]:
     out_dir = "tts"; os.makedirs(out_dir, exist_ok=True)
-    for seg in segs:
-        text = seg.get("translated", "").strip()
-        if not text: continue
-        path = run_piper(text, target, out_dir)
-        if path: urls.append(f"/sessions/{session}/tts/{os.path.basename(path)}")
-    return urls
+    texts = [t for t in (seg.get("translated", "").strip() for seg in segs) if t]
+    if not texts: return []
+    paths = await asyncio.gather(*(_run_in(_tts_executor, run_piper, text, target, out_dir) for text in texts))
+    return [f"/sessions/{session}/tts/{os.path.basename(path)}" for path in paths if path]
 
 
 # ============================================================================
@@ -413,32 +1300,59 @@ def _calculate_pcm_rms(pcm_float) -> float:
     """Calculate RMS (root mean square) of PCM audio samples."""
     if not pcm_float:
         return 0.0
-    return math.sqrt(sum(s * s for s in pcm_float) / len(pcm_float))
+    import numpy as np
+    samples = np.frombuffer(pcm_float, dtype=np.float32)
+    return float(np.sqrt(np.mean(samples * samples)))
 
 
-def _update_calibration(sess: dict, rms: float, chunk_duration: float) -> bool:
-    """Update adaptive silence calibration with new RMS sample."""
-    if sess["baseline_rms"] is not None:
-        return False  # Already calibrated
-    
-    sess["calibration_samples"].append(rms)
-    calibration_duration = len(sess["calibration_samples"]) * chunk_duration
-    
-    if calibration_duration >= SILENCE_CALIBRATION_DURATION:
-        # Finish calibration
-        sess["baseline_rms"] = sum(sess["calibration_samples"]) / len(sess["calibration_samples"])
-        raw_threshold = sess["baseline_rms"] * SILENCE_MULTIPLIER
-        sess["adaptive_threshold"] = min(raw_threshold, MAX_SILENCE_THRESHOLD)  # Cap it
+def _update_noise_floor(sess: dict, pcm_float, sample_rate: int) -> None:
+    """Feed frame energies into the session's rolling window and re-estimate the floor.
+
+    The floor is a low percentile of frame RMS over the last NOISE_WINDOW_S, so it
+    follows the room (HVAC, typing) and is not skewed by speech at session start.
+    """
+    import numpy as np
+    noise = sess["noise"]
+    frame = max(1, sample_rate * NOISE_FRAME_MS // 1000)
+    samples = np.frombuffer(pcm_float, dtype=np.float32)
+    n = len(samples) // frame
+    if n:
+        frames = samples[:n * frame].reshape(n, frame)
+        noise["frames"].extend(np.sqrt(np.mean(frames * frames, axis=1)).tolist())
+    if len(noise["frames"]) * NOISE_FRAME_MS / 1000 < SILENCE_CALIBRATION_DURATION:
+        return  # still calibrating (or refilling after recovery)
+    first = sess["baseline_rms"] is None
+    sess["baseline_rms"] = float(np.percentile(np.fromiter(noise["frames"], dtype=np.float32), NOISE_PERCENTILE))
+    sess["adaptive_threshold"] = min(max(sess["baseline_rms"] * SILENCE_MULTIPLIER, MIN_SILENCE_THRESHOLD), MAX_SILENCE_THRESHOLD)
+    if first:
         logging.info(
             f"Session {sess.get('session_id', 'unknown')}: calibrated "
-            f"baseline_rms={sess['baseline_rms']:.4f}, "
-            f"raw_threshold={raw_threshold:.4f}, "
-            f"capped_threshold={sess['adaptive_threshold']:.4f}"
+            f"noise_floor={sess['baseline_rms']:.4f}, threshold={sess['adaptive_threshold']:.4f}"
         )
-        sess["calibration_samples"] = []  # Free memory
-        return True
-    
-    return False
+
+
+def _is_silence(sess: dict, rms: float, chunk_duration: float) -> bool:
+    """Speech/silence decision with hysteresis and hangover.
+
+    Speech starts above the threshold, continues down to threshold * VAD_HYSTERESIS,
+    and the VAD_HANGOVER_S after it ends is still decoded to keep trailing words.
+    """
+    noise = sess["noise"]
+    threshold = _get_silence_threshold(sess)
+    if rms >= threshold or (noise["in_speech"] and rms >= threshold * VAD_HYSTERESIS):
+        noise["in_speech"] = True
+        noise["hangover"] = VAD_HANGOVER_S
+        decision = "speech"
+    elif noise["hangover"] > 0:
+        noise["in_speech"] = False
+        noise["hangover"] -= chunk_duration
+        decision = "hangover"
+    else:
+        noise["in_speech"] = False
+        decision = "silence"
+    metrics.inc("vad_chunks_total", decision=decision)
+    admission.observe_chunk(decision != "silence")
+    return decision == "silence"
 
 
 def _get_silence_threshold(sess: dict) -> float:
@@ -448,6 +1362,7 @@ def _get_silence_threshold(sess: dict) -> float:
     return float(os.environ.get("PCM_SILENCE_RMS", "0.007"))
 
 
+@_timed("pcm_to_wav")
 def _pcm_to_wav(pcm_float, sample_rate: int) -> str:
     """Convert PCM float32 data to temporary WAV file. Returns path."""
     wav_path = os.path.join(tempfile.gettempdir(), f"tmp_{uuid.uuid4().hex}.wav")
@@ -455,14 +1370,15 @@ def _pcm_to_wav(pcm_float, sample_rate: int) -> str:
         wf.setnchannels(1)
         wf.setsampwidth(2)
         wf.setframerate(sample_rate)
+        import numpy as np
         pcm_int16 = (np.array(pcm_float, dtype=np.float32) * 32767).astype(np.int16)
         wf.writeframes(pcm_int16.tobytes())
     return wav_path
 
 
-def _build_silence_response(sess: dict, rms: float, silence_threshold: float, target: str, caption_lang: str) -> dict:
+async def _build_silence_response(sess: dict, rms: float, silence_threshold: float, target: str, caption_lang: str) -> dict:
     """Build JSON response for silent PCM chunk."""
-    live_bundle = _compute_live_from_pending(sess.get("pending_buf"), target=target, caption_lang=caption_lang)
+    live_bundle = await _compute_live_from_pending(sess, target=target, caption_lang=caption_lang)
     return {
         "silence": True,
         "rms": rms,
@@ -473,7 +1389,7 @@ def _build_silence_response(sess: dict, rms: float, silence_threshold: float, ta
     }
 
 
-def _build_transcription_response(
+async def _build_transcription_response(
     sess: dict,
     finalized_segments: list[dict],
     tts_urls: list[str],
@@ -484,7 +1400,7 @@ def _build_transcription_response(
     caption_lang: str
 ) -> dict:
     """Build JSON response for successfully transcribed PCM chunk."""
-    live_bundle = _compute_live_from_pending(sess.get("pending_buf"), target=target, caption_lang=caption_lang)
+    live_bundle = await _compute_live_from_pending(sess, target=target, caption_lang=caption_lang)
     
     if live_bundle["liveText"]:
         live_text = live_bundle["liveText"]
@@ -508,13 +1424,193 @@ def _build_transcription_response(
     }
 
 
+# ============================================================================
+# Admission Control
+# ============================================================================
+
+class _AdmissionController:
+    """Estimates remaining real-time decode capacity and gates new streams.
+
+    Each active stream costs rtf * duty of one decode slot, where rtf is the
+    moving average of measured real-time factor and duty the fraction of chunks
+    that pass the silence gate. A new stream is refused when the node would go
+    above ADMISSION_MAX_UTILIZATION of DECODE_SLOTS, or ADMISSION_MAX_STREAMS.
+
+    Capacity accounting (`streams`) forgets an HTTP stream after STREAM_IDLE_S,
+    but the session stays `admitted` for ADMISSION_SESSION_TTL_S, so a speaker
+    who pauses (clients stop posting during silence) is never refused later.
+    """
+
+    EMA_ALPHA = 0.1
+
+    def __init__(self):
+        self.streams: Dict[str, float] = {}  # session -> last seen (inf while a WS is open)
+        self.admitted: Dict[str, float] = {}  # session -> last activity, for the admission TTL
+        self.buckets: Dict[str, List[float]] = {}  # session -> [tokens, last refill]
+        self.rtf: Optional[float] = None
+        self.duty = 1.0
+        self.rejected = 0
+
+    def observe_rtf(self, rtf: float):
+        self.rtf = rtf if self.rtf is None else self.rtf + self.EMA_ALPHA * (rtf - self.rtf)
+
+    def observe_chunk(self, decoded: bool):
+        self.duty += self.EMA_ALPHA * ((1.0 if decoded else 0.0) - self.duty)
+
+    def utilization(self, extra_streams: int = 0) -> float:
+        # An idle node always takes a stream: rtf only updates while decoding,
+        # so a stale high estimate must not lock out the first newcomer.
+        if not self.streams:
+            return 0.0
+        rtf = self.rtf if self.rtf is not None else ADMISSION_DEFAULT_RTF
+        return (len(self.streams) + extra_streams) * rtf * self.duty / max(1, DECODE_SLOTS)
+
+    def _prune(self, now: float):
+        for sid in [sid for sid, seen in self.streams.items() if now - seen > STREAM_IDLE_S]:
+            del self.streams[sid]
+        for sid in [sid for sid, seen in self.admitted.items() if now - seen > ADMISSION_SESSION_TTL_S and sid not in self.streams]:
+            del self.admitted[sid]
+            self.buckets.pop(sid, None)
+        if not self.streams:
+            self.rtf = None
+
+    def admit(self, session_id: str, persistent: bool = False) -> Optional[str]:
+        """Register activity for a stream; returns a refusal reason for a new one over capacity."""
+        now = time.monotonic()
+        if session_id in self.streams or session_id in self.admitted:
+            # Re-counted toward capacity, but an admitted session is never refused
+            if self.streams.get(session_id) != math.inf:
+                self.streams[session_id] = math.inf if persistent else now
+            self.admitted[session_id] = now
+            return None
+        self._prune(now)
+        reason = None
+        if ADMISSION_MAX_STREAMS and len(self.streams) >= ADMISSION_MAX_STREAMS:
+            reason = "stream limit reached"
+        elif self.utilization(extra_streams=1) > ADMISSION_MAX_UTILIZATION:
+            reason = "decode capacity exhausted"
+        if reason:
+            self.rejected += 1
+            metrics.inc("admission_rejected_total", reason=reason.split()[0])
+            return reason
+        self.streams[session_id] = math.inf if persistent else now
+        self.admitted[session_id] = now
+        return None
+
+    def release(self, session_id: str):
+        """Stop counting a closed stream; it may reconnect within the TTL without being gated."""
+        self.streams.pop(session_id, None)
+        if session_id in self.admitted:
+            self.admitted[session_id] = time.monotonic()
+        if not self.streams:
+            self.rtf = None  # re-measure from the next decode rather than the last load
+
+    def rate_limit(self, session_id: str) -> Optional[float]:
+        """Token bucket per session; returns seconds to wait when the post is over the limit."""
+        now = time.monotonic()
+        bucket = self.buckets.setdefault(session_id, [INGEST_RATE_BURST, now])
+        bucket[0] = min(INGEST_RATE_BURST, bucket[0] + (now - bucket[1]) * INGEST_RATE_PER_S)
+        bucket[1] = now
+        if bucket[0] >= 1.0:
+            bucket[0] -= 1.0
+            return None
+        metrics.inc("ingest_rate_limited_total")
+        return (1.0 - bucket[0]) / INGEST_RATE_PER_S
+
+    def stats(self) -> Dict[str, Any]:
+        self._prune(time.monotonic())
+        return {
+            "active_streams": len(self.streams),
+            "admitted_sessions": len(self.admitted),
+            "rtf": round(self.rtf, 3) if self.rtf is not None else None,
+            "duty": round(self.duty, 3),
+            "utilization": round(self.utilization(), 3),
+            "accepting": self.utilization(extra_streams=1) <= ADMISSION_MAX_UTILIZATION
+                         and not (ADMISSION_MAX_STREAMS and len(self.streams) >= ADMISSION_MAX_STREAMS),
+            "rejected": self.rejected,
+        }
+
+
+admission = _AdmissionController()
+
+
+def _check_admission(request: Request, session_id: str) -> Optional[JSONResponse]:
+    """Gate an HTTP ingest post: 503/307 when the node is full, 429 when over the rate."""
+    reason = admission.admit(session_id)
+    if reason:
+        body = {"error": "overloaded", "reason": reason, "retry_after": ADMISSION_RETRY_AFTER_S}
+        if ADMISSION_REDIRECT_URL:
+            location = ADMISSION_REDIRECT_URL.rstrip("/") + request.url.path + (f"?{request.url.query}" if request.url.query else "")
+            return JSONResponse({**body, "redirect": location}, status_code=307, headers={"Location": location})
+        return JSONResponse(body, status_code=503, headers={"Retry-After": str(ADMISSION_RETRY_AFTER_S)})
+    wait = admission.rate_limit(session_id)
+    if wait is not None:
+        retry = max(1, math.ceil(wait))
+        return JSONResponse({"error": "rate limited", "retry_after": retry}, status_code=429, headers={"Retry-After": str(retry)})
+    return None
+
+
 # ============================================================================
 # Endpoints
 # ============================================================================
 
+def _warm_up():
+    """Preload Whisper, Argos pairs and Piper voices, running a dummy inference on each."""
+    components = readiness["components"]
+    try:
+        readiness["stage"] = "whisper"
+        t0 = time.perf_counter()
+        wav_path = _pcm_to_wav(array.array('f', [0.0] * 16000), 16000)
+        try:
+            _decode_executor.submit(lambda: _model_transcribe(get_model(WHISPER_MODEL_SIZE), wav_path, temperature=0.0, record_rtf=False)).result()
+        finally:
+            try: os.remove(wav_path)
+            except Exception: pass
+        components["whisper"] = {"model": _current_model_name, "seconds": round(time.perf_counter() - t0, 2)}
+
+        readiness["stage"] = "translation"
+        translation_router.refresh()
+        for src, dst in WARMUP_LANG_PAIRS:
+            t0 = time.perf_counter()
+            # On the translation pool so translator threads get its core set
+            _, missing = _translate_executor.submit(translate_text, "Hello.", src, dst).result()
+            components[f"argos:{src}-{dst}"] = {"missing": missing, "seconds": round(time.perf_counter() - t0, 2)}
+
+        readiness["stage"] = "tts"
+        out_dir = tempfile.gettempdir()
+        for lang in VOICE_MAP:
+            t0 = time.perf_counter()
+            path = run_piper("Hello.", lang, out_dir)
+            if path:
+                try: os.remove(path)
+                except Exception: pass
+            components[f"piper:{lang}"] = {"available": bool(path), "seconds": round(time.perf_counter() - t0, 2)}
+
+        readiness["stage"] = "done"
+        readiness["ready"] = True
+        logging.info(f"Warm-up complete: {components}")
+    except Exception as e:
+        # Stay not-ready: a node that cannot load Whisper should not receive traffic
+        readiness["stage"] = "failed"
+        readiness["error"] = str(e)
+        logging.error(f"Warm-up failed: {e}")
+
+
 @app.on_event("startup")
-def startup():
+async def startup():
     ensure_argos_languages()
+    if SESSION_PERSIST:
+        recovered = await asyncio.to_thread(session_log.recover)
+        if recovered:
+            logging.info(f"Recovered {recovered} session(s) from {SESSION_LOG_DIR}")
+        session_log.start()
+    if WARMUP_ON_STARTUP:
+        app.state.warmup_task = asyncio.create_task(asyncio.to_thread(_warm_up))
+
+
+@app.on_event("shutdown")
+def shutdown():
+    session_log.stop()
 
 
 @app.get("/health")
@@ -522,6 +1618,30 @@ async def health():
     return {"status": "ok"}
 
 
+@app.get("/ready")
+async def ready():
+    """Readiness probe: 503 until the startup warm-up has finished."""
+    return JSONResponse({**readiness, "admission": admission.stats()}, status_code=200 if readiness["ready"] else 503)
+
+
+@app.get("/metrics")
+async def get_metrics():
+    """Prometheus text exposition of stage latencies, RTF, cache and queue stats."""
+    subs = [sub.stats() for sess in tuple(sessions.values()) for sub in tuple(sess["subscribers"].values())]
+    gauges = {
+        "sessions_active": len(sessions),
+        "subscribers_active": len(subs),
+        "subscriber_queue_depth": sum(st["queued"] for st in subs),
+        "subscriber_dropped": sum(st["dropped"] for st in subs),
+        "subscriber_max_lag_seconds": max((st["lag_s"] for st in subs), default=0.0),
+    }
+    adm = admission.stats()
+    gauges["admission_active_streams"] = adm["active_streams"]
+    gauges["admission_utilization"] = adm["utilization"]
+    gauges["admission_accepting"] = 1 if adm["accepting"] else 0
+    return PlainTextResponse(metrics.render(gauges), media_type="text/plain; version=0.0.4")
+
+
 @app.post("/ingest/pcm")
 async def ingest_pcm(
     request: Request,
@@ -532,11 +1652,16 @@ async def ingest_pcm(
     word_timestamps: bool = Query(False),
     beam_size: Optional[int] = Query(None),
     use_temp_fallback: bool = Query(True),
-    model: str = Query("small"),  # New param
+    model: Optional[str] = Query(None),  # None: WHISPER_MODEL, the one warm-up loaded
+    timings: bool = Query(False),
 ):
     """
     Ingest raw PCM float32 [-1,1] and transcribe with adaptive silence gating.
     """
+    rejected = _check_admission(request, session)
+    if rejected:
+        return rejected
+    _request_timings.set({} if timings else None)
     # Parse PCM data
     body = await request.body()
     if not body:
@@ -551,122 +1676,140 @@ async def ingest_pcm(
     
     # Initialize session and timing
     sess = ensure_session(session)
-    chunk_duration = len(pcm_float) / sample_rate
-    time_offset = sess.get("accumulated_duration", 0.0)
+    # Decode runs off the event loop; the lock keeps one session's chunks in order
+    async with sess["decode_lock"]:
+        chunk_duration = len(pcm_float) / sample_rate
+        time_offset = sess.get("accumulated_duration", 0.0)
     
-    # Calculate RMS and update calibration
-    rms = _calculate_pcm_rms(pcm_float)
-    _update_calibration(sess, rms, chunk_duration)
+        # Calculate RMS and update the noise floor
+        rms = _calculate_pcm_rms(pcm_float)
+        _update_noise_floor(sess, pcm_float, sample_rate)
     
-    # Determine silence threshold and check for silence
-    silence_threshold = _get_silence_threshold(sess)
+        # Determine silence threshold and check for silence
+        silence_threshold = _get_silence_threshold(sess)
     
-    if rms < silence_threshold:
-        sess["accumulated_duration"] = time_offset + chunk_duration
-        return _build_silence_response(sess, rms, silence_threshold, target, caption_lang)
+        if _is_silence(sess, rms, chunk_duration):
+            sess["accumulated_duration"] = time_offset + chunk_duration
+            session_log.record_state(sess)
+            return await _build_silence_response(sess, rms, silence_threshold, target, caption_lang)
     
-    # Transcribe the audio chunk
-    wav_path = None
-    try:
-        # Convert PCM to WAV
-        wav_path = _pcm_to_wav(pcm_float, sample_rate)
+        # Transcribe the audio chunk
+        wav_path = None
+        try:
+            # Convert PCM to WAV
+            wav_path = _pcm_to_wav(pcm_float, sample_rate)
         
-        # Transcribe with advanced features
-        model_instance = get_model(model)
-        segs, lang, _ = _try_transcribe_with_fallback(
-            model_instance, wav_path, keep=False,
-            word_timestamps=word_timestamps,
-            beam_size=beam_size,
-            use_temp_fallback=use_temp_fallback
-        )
-        raw_segments = _process_transcribed_segments(segs, lang)
+            # Transcribe with advanced features
+            segs, lang, _ = await _run_decode(
+                _transcribe_with_model, model, wav_path, keep=False,
+                word_timestamps=word_timestamps,
+                beam_size=beam_size,
+                use_temp_fallback=use_temp_fallback,
+                sess=sess,
+            )
+            raw_segments = _filter_hallucinations(_process_transcribed_segments(segs, lang), sess)
         
-        # Finalize segments (sentence merging, translation)
-        finalized_segments, missing_pack = _finalize_segments(
-            raw_segments, sess, target=target, caption_lang=caption_lang, offset=time_offset
-        )
-        sess["accumulated_duration"] = time_offset + chunk_duration
+            # Finalize segments (sentence merging, translation)
+            finalized_segments, missing_pack = await _finalize_segments(
+                raw_segments, sess, target=target, caption_lang=caption_lang, offset=time_offset
+            )
+            sess["accumulated_duration"] = time_offset + chunk_duration
+            session_log.record_state(sess)
         
-    except Exception as e:
-        logging.error(f"PCM transcription failed: {e}")
-        return JSONResponse({"error": f"PCM transcription failed: {e}"}, status_code=500)
+        except Exception as e:
+            logging.error(f"PCM transcription failed: {e}")
+            return JSONResponse({"error": f"PCM transcription failed: {e}"}, status_code=500)
     
-    finally:
-        if wav_path:
-            try: os.remove(wav_path)
-            except Exception: pass
+        finally:
+            if wav_path:
+                try: os.remove(wav_path)
+                except Exception: pass
     
     # Synthesize TTS and build response
-    tts_urls = _maybe_synthesize_tts(finalized_segments, target, session)
-    response = _build_transcription_response(
+    tts_urls = await _maybe_synthesize_tts(finalized_segments, target, session)
+    response = await _build_transcription_response(
         sess, finalized_segments, tts_urls, missing_pack, rms, silence_threshold, target, caption_lang
     )
     
     # Broadcast to WebSocket subscribers
-    await _broadcast_segments(session, {
+    _broadcast_segments(session, {
         "event": "segments",
         "liveText": response["liveText"],
         "liveTranslated": response["liveTranslated"],
         "liveCaption": response["liveCaption"],
         "newSegments": finalized_segments,
         "hasPending": bool(sess.get("pending_buf")),
-    })
+    }, caption_lang=caption_lang)
     
+    if timings:
+        response["timings"] = _request_timings.get()
     return response
 
 
 @app.post("/ingest")
 async def ingest(
+    request: Request,
     session: str = Query(...),
     target: str = Query("es"),
     caption_lang: str = Query("es"),
     keep: bool = Query(False),
+    timings: bool = Query(False),
     file: UploadFile = File(...),
 ):
     """
     Standard ingestion for file uploads (non-PCM).
     """
+    rejected = _check_admission(request, session)
+    if rejected:
+        return rejected
+    _request_timings.set({} if timings else None)
     data = await file.read()
     if not data: return JSONResponse({"error": "empty chunk"}, status_code=400)
     sess = ensure_session(session)
     in_path = await _write_temp(data)
-    try:
-        # Use the rich transcription fallback
-        model = get_model()
-        segs, lang, _ = _try_transcribe_with_fallback(model, in_path, keep=keep)
-        raw = _process_transcribed_segments(segs, lang)
+    async with sess["decode_lock"]:
+        try:
+            # Use the rich transcription fallback
+            segs, lang, info = await _run_decode(_transcribe_with_model, None, in_path, keep=keep, sess=sess)
+            processed = _process_transcribed_segments(segs, lang)
+            # Upload length (else last decoded end), taken before filtering so
+            # dropped segments still advance the timeline
+            duration = float(getattr(info, "duration", 0.0) or 0.0) or (float(processed[-1]["end"]) if processed else 0.0)
+            raw = _filter_hallucinations(processed, sess)
         
-        finalized, missing_pack = _finalize_segments(raw, sess, target=target, caption_lang=caption_lang, offset=sess.get("accumulated_duration", 0.0))
-        # approximate duration using last end
-        if raw: sess["accumulated_duration"] = raw[-1]["end"]
-    except Exception as e:
-        return JSONResponse({"error": f"transcription failed: {e}"}, status_code=500)
-    finally:
-        if not keep:
-            try: os.remove(in_path)
-            except Exception: pass
+            offset = sess.get("accumulated_duration", 0.0)
+            finalized, missing_pack = await _finalize_segments(raw, sess, target=target, caption_lang=caption_lang, offset=offset)
+            sess["accumulated_duration"] = offset + duration
+            session_log.record_state(sess)
+        except Exception as e:
+            return JSONResponse({"error": f"transcription failed: {e}"}, status_code=500)
+        finally:
+            if not keep:
+                try: os.remove(in_path)
+                except Exception: pass
             
-    tts_urls = _maybe_synthesize_tts(finalized, target, session)
-    live = _compute_live_from_pending(sess.get("pending_buf"), target=target, caption_lang=caption_lang)
+    tts_urls = await _maybe_synthesize_tts(finalized, target, session)
+    live = await _compute_live_from_pending(sess, target=target, caption_lang=caption_lang)
     live_text = live["liveText"] or (finalized[-1]["text"] if finalized else "")
     live_translated = live["liveTranslated"] or (finalized[-1].get("translated", "") if finalized else "")
     live_caption = live["liveCaption"] or (finalized[-1].get("caption_text", live_translated) if finalized else "")
     
-    await _broadcast_segments(session, {
+    _broadcast_segments(session, {
         "event": "segments",
         "liveText": live_text,
         "liveTranslated": live_translated,
         "liveCaption": live_caption,
         "newSegments": finalized,
         "hasPending": bool(sess.get("pending_buf")),
-    })
+    }, caption_lang=caption_lang)
     return {
         "liveText": live_text,
         "liveTranslated": live_translated,
         "liveCaption": live_caption,
         "newSegments": finalized,
         "ttsUrls": tts_urls,
-        "missingLanguagePack": f"{target}-{caption_lang}" if finalized and missing_pack else None
+        "missingLanguagePack": f"{target}-{caption_lang}" if finalized and missing_pack else None,
+        **({"timings": _request_timings.get()} if timings else {}),
     }
 
 
@@ -685,6 +1828,19 @@ async def websocket_pcm_stream(websocket: WebSocket):
     if beam_size:
         beam_size = int(beam_size)
     use_temp_fallback = websocket.query_params.get("use_temp_fallback", "true").lower() == "true"
+    timings = websocket.query_params.get("timings", "false").lower() == "true"
+    
+    reason = admission.admit(session_id, persistent=True)
+    if reason:
+        logging.info(f"WS PCM stream refused: session={session_id}, reason={reason}")
+        payload = {"error": "overloaded", "reason": reason, "retry_after": ADMISSION_RETRY_AFTER_S}
+        if ADMISSION_REDIRECT_URL:
+            payload["redirect"] = ADMISSION_REDIRECT_URL.rstrip("/").replace("http", "ws", 1) + websocket.url.path + (f"?{websocket.url.query}" if websocket.url.query else "")
+        try:
+            await websocket.send_json(payload)
+            await websocket.close(code=1013)  # Try Again Later
+        except Exception: pass
+        return
     
     sess = ensure_session(session_id)
     logging.info(f"WS PCM stream started: session={session_id}, target={target}, sample_rate={sample_rate}")
@@ -704,80 +1860,88 @@ async def websocket_pcm_stream(websocket: WebSocket):
             if not pcm_float:
                 await websocket.send_json({"silence": True, "newSegments": []})
                 continue
+            _request_timings.set({} if timings else None)
             
-            # Calculate timing and RMS
-            chunk_duration = len(pcm_float) / sample_rate
-            time_offset = sess.get("accumulated_duration", 0.0)
+            async with sess["decode_lock"]:
+                # Calculate timing and RMS
+                chunk_duration = len(pcm_float) / sample_rate
+                time_offset = sess.get("accumulated_duration", 0.0)
             
-            rms = _calculate_pcm_rms(pcm_float)
-            _update_calibration(sess, rms, chunk_duration)
+                rms = _calculate_pcm_rms(pcm_float)
+                _update_noise_floor(sess, pcm_float, sample_rate)
             
-            # Check for silence
-            silence_threshold = _get_silence_threshold(sess)
-            logging.info(f"[DEBUG] RMS={rms:.4f}, threshold={silence_threshold:.4f}, is_silence={rms < silence_threshold}")
+                # Check for silence
+                silence_threshold = _get_silence_threshold(sess)
+                is_silence = _is_silence(sess, rms, chunk_duration)
+                logging.info(f"[DEBUG] RMS={rms:.4f}, threshold={silence_threshold:.4f}, is_silence={is_silence}")
             
-            if rms < silence_threshold:
-                sess["accumulated_duration"] = time_offset + chunk_duration
-                response = _build_silence_response(sess, rms, silence_threshold, target, caption_lang)
-                await websocket.send_json(response)
-                continue
+                if is_silence:
+                    sess["accumulated_duration"] = time_offset + chunk_duration
+                    session_log.record_state(sess)
+                    response = await _build_silence_response(sess, rms, silence_threshold, target, caption_lang)
+                    await websocket.send_json(response)
+                    continue
             
-            logging.info(f"[DEBUG] Audio is NOT silent, proceeding to transcription...")
+                logging.info(f"[DEBUG] Audio is NOT silent, proceeding to transcription...")
             
-            # Transcribe the audio chunk
-            wav_path = None
-            try:
-                # Convert PCM to WAV (using helper)
-                wav_path = _pcm_to_wav(pcm_float, sample_rate)
+                # Transcribe the audio chunk
+                wav_path = None
+                try:
+                    # Convert PCM to WAV (using helper)
+                    wav_path = _pcm_to_wav(pcm_float, sample_rate)
                 
-                # Get model from query params
-                model_name = websocket.query_params.get("model", "small")
+                    # Get model from query params
+                    model_name = websocket.query_params.get("model")  # None: WHISPER_MODEL
                 
-                # Transcribe with advanced features
-                model_instance = get_model(model_name)
-                segs, lang, _ = _try_transcribe_with_fallback(
-                    model_instance, wav_path, keep=False,
-                    word_timestamps=word_timestamps,
-                    beam_size=beam_size,
-                    use_temp_fallback=use_temp_fallback
-                )
-                raw_segments = _process_transcribed_segments(segs, lang)
-                logging.info(f"WS PCM transcribed: lang={lang}, segments={len(raw_segments)}, text={[s.get('text','') for s in raw_segments]}")
+                    # Transcribe with advanced features
+                    segs, lang, _ = await _run_decode(
+                        _transcribe_with_model, model_name, wav_path, keep=False,
+                        word_timestamps=word_timestamps,
+                        beam_size=beam_size,
+                        use_temp_fallback=use_temp_fallback,
+                        sess=sess,
+                    )
+                    raw_segments = _filter_hallucinations(_process_transcribed_segments(segs, lang), sess)
+                    logging.info(f"WS PCM transcribed: lang={lang}, segments={len(raw_segments)}, text={[s.get('text','') for s in raw_segments]}")
                 
-                # Finalize segments
-                finalized_segments, missing_pack = _finalize_segments(
-                    raw_segments, sess, target=target, caption_lang=caption_lang, offset=time_offset
-                )
-                sess["accumulated_duration"] = time_offset + chunk_duration
+                    # Finalize segments
+                    finalized_segments, missing_pack = await _finalize_segments(
+                        raw_segments, sess, target=target, caption_lang=caption_lang, offset=time_offset
+                    )
+                    sess["accumulated_duration"] = time_offset + chunk_duration
+                    session_log.record_state(sess)
                 
-            except Exception as e:
-                logging.error(f"WS PCM transcription failed: {e}")
-                await websocket.send_json({"error": f"Transcription failed: {e}"})
-                continue
+                except Exception as e:
+                    logging.error(f"WS PCM transcription failed: {e}")
+                    await websocket.send_json({"error": f"Transcription failed: {e}"})
+                    continue
             
-            finally:
-                if wav_path:
-                    try: os.remove(wav_path)
-                    except Exception: pass
+                finally:
+                    if wav_path:
+                        try: os.remove(wav_path)
+                        except Exception: pass
             
             # Synthesize TTS and build response
-            tts_urls = _maybe_synthesize_tts(finalized_segments, target, session_id)
-            response = _build_transcription_response(
+            tts_urls = await _maybe_synthesize_tts(finalized_segments, target, session_id)
+            response = await _build_transcription_response(
                 sess, finalized_segments, tts_urls, missing_pack, rms, silence_threshold, target, caption_lang
             )
             
+            if timings:
+                response["timings"] = _request_timings.get()
+            
             # Send response via WebSocket
             await websocket.send_json(response)
             
             # Also broadcast to other subscribers
-            await _broadcast_segments(session_id, {
+            _broadcast_segments(session_id, {
                 "event": "segments",
                 "liveText": response["liveText"],
                 "liveTranslated": response["liveTranslated"],
                 "liveCaption": response["liveCaption"],
                 "newSegments": finalized_segments,
                 "hasPending": bool(sess.get("pending_buf")),
-            })
+            }, caption_lang=caption_lang)
     
     except WebSocketDisconnect:
         logging.info(f"WS PCM stream disconnected: session={session_id}")
@@ -785,25 +1949,33 @@ async def websocket_pcm_stream(websocket: WebSocket):
         logging.error(f"WS PCM stream error: {e}")
         try: await websocket.close()
         except Exception: pass
+    finally:
+        admission.release(session_id)
 
 
 @app.websocket("/ws/{session_id}")
 async def ws_session(session_id: str, websocket: WebSocket):
     await websocket.accept()
+    caption_lang = websocket.query_params.get("caption_lang")
+    # Off the loop: the first call may import Argos and scan installed packs
+    if caption_lang is not None and not await asyncio.to_thread(_known_caption_lang, caption_lang):
+        await websocket.send_json({"error": "unsupported caption_lang", "caption_lang": caption_lang[:16]})
+        await websocket.close(code=1008)
+        return
     sess = ensure_session(session_id)
-    sess["subscribers"].add(websocket)
-    logging.info(f"WS accepted session={session_id} active_subscribers={len(sess['subscribers'])}")
+    sub = _Subscriber(websocket, caption_lang=caption_lang)
+    sub.enqueue({"event": "hello", "session": session_id})
+    sub.start()
+    sess["subscribers"][websocket] = sub
+    logging.info(f"WS accepted session={session_id} caption_lang={sub.caption_lang} active_subscribers={len(sess['subscribers'])}")
     try:
-        try:
-            await websocket.send_json({"event": "hello", "session": session_id})
-        except Exception: pass
-        while True:
+        while not sub.closed:
             try: await websocket.receive_text()
             except WebSocketDisconnect: break
             except Exception: await asyncio.sleep(0.1)
     finally:
-        try: sess["subscribers"].discard(websocket)
-        except Exception: pass
+        sub.stop()
+        sess["subscribers"].pop(websocket, None)
         logging.info(f"WS closed session={session_id}")
 
 
@@ -821,11 +1993,143 @@ async def list_segments(session_id: str):
     return {"segments": sess["segments"]}
 
 
+# ============================================================================
+# Transcript Export
+# ============================================================================
+
+EXPORT_TRACKS = ("text", "translated", "caption_text")
+EXPORT_FORMATS = {
+    "srt": "application/x-subrip",
+    "vtt": "text/vtt",
+    "txt": "text/plain",
+    "jsonl": "application/x-ndjson",
+}
+EXPORT_BATCH = 200  # cues per chunk written to the response
+
+
+def _fmt_ts(seconds: float, sep: str) -> str:
+    ms = int(round(max(seconds, 0.0) * 1000))
+    h, ms = divmod(ms, 3_600_000)
+    m, ms = divmod(ms, 60_000)
+    sec, ms = divmod(ms, 1000)
+    return f"{h:02d}:{m:02d}:{sec:02d}{sep}{ms:03d}"
+
+
+def _export_lines(seg: Dict[str, Any], track: str) -> List[str]:
+    if track == "all":
+        lines: List[str] = []
+        for t in (seg.get(k, "") for k in EXPORT_TRACKS):
+            if t and t not in lines:
+                lines.append(t)
+        return lines or [""]
+    return [seg.get(track) or seg.get("text", "")]
+
+
+def _word_timed(seg: Dict[str, Any]) -> bool:
+    """Whether the segment's word timings spell out its whole text (else export the plain cue)."""
+    words = seg.get("words")
+    return bool(words) and _words(" ".join(w["word"] for w in words)) == _words(seg.get("text", ""))
+
+
+def _vtt_escape(text: str) -> str:
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+
+def _export_cue(fmt: str, index: int, seg: Dict[str, Any], track: str, words: bool) -> str:
+    start, end = float(seg.get("start", 0.0)), float(seg.get("end", 0.0))
+    if fmt == "jsonl":
+        return json.dumps(seg, ensure_ascii=False) + "\n"
+    if fmt == "txt":
+        return "\n".join(_export_lines(seg, track)) + "\n"
+    if fmt == "srt":
+        return f"{index}\n{_fmt_ts(start, ',')} --> {_fmt_ts(end, ',')}\n" + "\n".join(_export_lines(seg, track)) + "\n\n"
+    lines = [_vtt_escape(line) for line in _export_lines(seg, track)]
+    if words and track in ("text", "all") and _word_timed(seg):
+        # WebVTT karaoke-style timestamps on the source-text line
+        lines[0] = "".join(f"<{_fmt_ts(w['start'], '.')}><c>{_vtt_escape(w['word'])}</c>" for w in seg["words"]).strip()
+    return f"{index}\n{_fmt_ts(start, '.')} --> {_fmt_ts(end, '.')}\n" + "\n".join(lines) + "\n\n"
+
+
+def _iter_export(segments: List[Dict[str, Any]], fmt: str, track: str, words: bool):
+    """Yield the export in batches; segments appended while streaming are not included."""
+    if fmt == "vtt":
+        yield "WEBVTT\n\n"
+    total = len(segments)
+    index = 1
+    for batch_start in range(0, total, EXPORT_BATCH):
+        parts = []
+        for seg in segments[batch_start:min(batch_start + EXPORT_BATCH, total)]:
+            if fmt == "srt" and words and track in ("text", "all") and _word_timed(seg):
+                for w in seg["words"]:
+                    word_seg = {"start": w["start"], "end": w["end"], "text": w["word"].strip()}
+                    parts.append(_export_cue(fmt, index, word_seg, "text", False)); index += 1
+                # The other tracks keep one cue spanning the whole segment
+                rest = [t for t in _export_lines(seg, track) if t != seg.get("text", "")] if track == "all" else []
+                if rest:
+                    parts.append(_export_cue(fmt, index, {**seg, "text": "\n".join(rest)}, "text", False)); index += 1
+                continue
+            parts.append(_export_cue(fmt, index, seg, track, words)); index += 1
+        yield "".join(parts)
+
+
+@app.get("/sessions/{session_id}/export")
+async def export_segments(
+    session_id: str,
+    format: str = Query("srt"),
+    track: str = Query("text"),
+    words: bool = Query(False),
+):
+    """Stream the session transcript as SRT, WebVTT, plain text or JSONL.
+
+    `track` picks text / translated / caption_text (or `all`, one line each).
+    `words=true` uses word timings when the session ran with word_timestamps:
+    one cue per word for SRT, inline timestamps for WebVTT.
+    """
+    sess = sessions.get(session_id)
+    if sess is None:
+        return JSONResponse({"error": "session not found"}, status_code=404)
+    if format not in EXPORT_FORMATS:
+        return JSONResponse({"error": f"format must be one of {sorted(EXPORT_FORMATS)}"}, status_code=400)
+    if track not in EXPORT_TRACKS + ("all",):
+        return JSONResponse({"error": f"track must be one of {list(EXPORT_TRACKS) + ['all']}"}, status_code=400)
+    safe_name = urllib.parse.quote(session_id, safe="")
+    return StreamingResponse(
+        _iter_export(sess["segments"], format, track, words),
+        media_type=f"{EXPORT_FORMATS[format]}; charset=utf-8",
+        headers={"Content-Disposition": f'attachment; filename="{safe_name}.{format}"'},
+    )
+
+
+@app.get("/sessions/{session_id}/subscribers")
+async def list_subscribers(session_id: str):
+    """Per-viewer queue depth, drops and send lag, to spot who is falling behind."""
+    sess = ensure_session(session_id)
+    return {"subscribers": [sub.stats() for sub in tuple(sess["subscribers"].values())]}
+
+
+@app.get("/sessions/{session_id}/filtered")
+async def get_filtered_counts(session_id: str):
+    """How many segments the hallucination filter dropped, by reason."""
+    sess = ensure_session(session_id)
+    return {"filtered": sess["filtered"], "total": sum(sess["filtered"].values())}
+
+
+@app.post("/sessions/{session_id}/language")
+async def set_session_language(session_id: str, lang: str = Query("auto")):
+    """Pin the session's decode language, or with `auto` clear the pin and re-detect."""
+    if not await asyncio.to_thread(_known_caption_lang, lang):
+        return JSONResponse({"error": "unsupported language"}, status_code=400)
+    sess = ensure_session(session_id)
+    _reset_decode_language(sess, None if lang == "auto" else lang)
+    session_log.record_state(sess)
+    return {"language": sess["decode_ctx"]["language"]}
+
+
 @app.get("/api/translation/available")
 async def get_available_translations():
     """Return list of installed Argos Translate language packs."""
     try:
-        installed = argostranslate.package.get_installed_packages()
+        installed = _lazy_argos_package().get_installed_packages()
         packs = []
         for pkg in installed:
             packs.append({
@@ -835,11 +2139,18 @@ async def get_available_translations():
                 "to_name": pkg.to_name,
                 "package_version": getattr(pkg, 'package_version', 'unknown')
             })
-        return {"available": True, "packs": packs, "count": len(packs)}
+        return {"available": True, "packs": packs, "count": len(packs), "pivot": PIVOT_LANG, "routes": translation_router.snapshot()}
     except Exception as e:
         return {"available": False, "error": str(e), "packs": []}
 
 
+@app.post("/api/translation/refresh")
+async def refresh_translation_routes():
+    """Re-read installed Argos packs after installing new ones."""
+    await asyncio.to_thread(translation_router.refresh)
+    return {"pivot": PIVOT_LANG}
+
+
 @app.get("/api/config/models")
 async def get_available_models():
     """Return available Whisper model sizes and current configuration."""
@@ -849,5 +2160,6 @@ async def get_available_models():
         "current_device": DEVICE,
         "current_compute_type": WHISPER_COMPUTE_TYPE or "auto",
         "current_beam_size": WHISPER_BEAM_SIZE,
-        "temperature_sequence": WHISPER_TEMPS
+        "temperature_sequence": WHISPER_TEMPS,
+        "resources": resource_plan(),
     }
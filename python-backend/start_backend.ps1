@@ -12,6 +12,9 @@ $env:WHISPER_MODEL = "tiny"           # tiny=fast, small=balanced, medium=accura
 $env:WHISPER_DEVICE = "cpu"           # cpu (no GPU) or cuda (with GPU)
 $env:WHISPER_COMPUTE_TYPE = "int8"    # int8 for CPU, float16 for GPU
 
+# CPU thread budgets (unset = split CPU_BUDGET ~60/25/15 across Whisper/translation/TTS)
+$env:WHISPER_NUM_WORKERS = "1"        # concurrent decodes sharing one model
+
 # Advanced features
 $env:SILENCE_CALIBRATION_DURATION = "1.5"
 $env:SILENCE_MULTIPLIER = "2.5"